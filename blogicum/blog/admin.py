@@ -1,5 +1,8 @@
 from django.contrib import admin
+from .admin_filters import AuthorFilter, LocationFilter
 from .models import Post, Category, Location, Comment  # Импорт Comment
+from .paginators import EstimatedCountPaginator
+from .search import search_posts
 
 
 @admin.register(Post)
@@ -18,14 +21,26 @@ class PostAdmin(admin.ModelAdmin):
         "is_published",
         "pub_date",
         "category",
-        "author",
-        "location",
+        AuthorFilter,  # Поле ввода вместо списка всех пользователей
+        LocationFilter,
     )
     search_fields = (
         "title",
         "text",
     )
     empty_value_display = "-не указано-"  # Отображение полей с NULL
+    # Автор, категория и место — одним JOIN, а не запросом на строку
+    list_select_related = ("author", "category", "location")
+    autocomplete_fields = ("author", "category", "location")
+    # Без отдельного COUNT(*) всей таблицы рядом с отфильтрованным
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        # Поиск по полнотекстовому индексу вместо LIKE '%...%' по тексту
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
 
 
 @admin.register(Category)
@@ -65,5 +80,10 @@ class CommentAdmin(admin.ModelAdmin):
         "author",
         "created_at",
     )
-    list_filter = ("created_at", "author")
+    list_filter = ("created_at", AuthorFilter)
     search_fields = ("text", "post__title", "author__username")
+    list_select_related = ("post", "author")
+    raw_id_fields = ("post",)
+    autocomplete_fields = ("author",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,57 @@
+"""Фильтры админки, которые не выводят список всех значений.
+
+Стандартный фильтр по внешнему ключу рендерит всех пользователей или все
+места — на миллионах строк это тяжёлый запрос и огромная страница.
+Здесь значение вводится в поле, а фильтр ищет по нему в индексе.
+"""
+from django.contrib import admin
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр с текстовым полем вместо списка вариантов.
+
+    Наследники задают ``lookup`` — поле, по которому ищется введённое
+    значение, например ``"author__username"``.
+    """
+
+    template = "admin/blog/input_filter.html"
+    lookup = None
+
+    def lookups(self, request, model_admin):
+        return ()
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        return queryset.filter(**{self.lookup: value.strip()})
+
+    def choices(self, changelist):
+        # Единственный «вариант» — сброс фильтра; остальные параметры
+        # списка передаются форме скрытыми полями
+        yield {
+            "selected": not self.value(),
+            "query_string": changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            "query_parts": [
+                (key, value)
+                for key, value in changelist.get_filters_params().items()
+                if key != self.parameter_name
+            ],
+        }
+
+
+class AuthorFilter(InputFilter):
+    title = "автору (логин)"
+    parameter_name = "author"
+    lookup = "author__username"
+
+
+class LocationFilter(InputFilter):
+    title = "местоположению"
+    parameter_name = "location"
+    lookup = "location__name"
@@ -6,3 +6,8 @@ class BlogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "blog"
     verbose_name = "Блог"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Настройка соединений SQLite: до первого запроса к базе
+        from blogicum import sqlite  # noqa: F401
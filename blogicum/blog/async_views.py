@@ -0,0 +1,225 @@
+"""Асинхронные (ASGI) варианты страниц чтения.
+
+ORM в Django 3.2 синхронный, поэтому каждый запрос к БД выполняется через
+``sync_to_async``, а независимые запросы одной страницы (страница постов,
+общее количество, категория, комментарии) — параллельно в пуле потоков.
+Включаются настройкой ``BLOG_ASYNC_VIEWS``.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connection
+from django.http import Http404
+from django.shortcuts import render
+from django.utils import timezone
+
+from .caching import add_feed_expiry, get_cached_feed_page, store_feed_page
+from .conditional import (
+    conditional_page,
+    get_category_state,
+    get_index_state,
+    get_post_state,
+)
+from .forms import CommentForm
+from .models import Category, Post
+from .paginators import CountingPaginator, CursorPaginator
+from .views import (
+    POSTS_PER_PAGE,
+    get_post_comments,
+    get_posts_with_comments,
+    get_published_posts,
+)
+
+User = get_user_model()
+
+
+def _in_worker_thread(func):
+    """Закрывает соединение потока-исполнителя по правилам CONN_MAX_AGE."""
+    def wrapper():
+        try:
+            return func()
+        finally:
+            close_old_connections()
+    return wrapper
+
+
+async def gather_queries(*funcs):
+    """Выполняет независимые запросы параллельно, если СУБД это позволяет.
+
+    SQLite (в том числе тестовая база в памяти) не разделяет данные между
+    соединениями разных потоков, поэтому для неё запросы идут по очереди.
+    """
+    if connection.vendor == "sqlite":
+        return await sync_to_async(lambda: [func() for func in funcs])()
+    return await asyncio.gather(
+        *(
+            sync_to_async(_in_worker_thread(func), thread_sensitive=False)()
+            for func in funcs
+        )
+    )
+
+
+def _get_page_number(request):
+    try:
+        return max(int(request.GET.get("page") or 1), 1)
+    except ValueError:
+        return 1
+
+
+def get_page_loaders(request, post_list, feed_key=None):
+    """Независимые запросы страницы ленты и функция сборки страницы.
+
+    В нумерованном режиме запрошенная страница читается одновременно
+    с подсчётом общего количества; если номер оказался за пределами
+    ленты, сборка вернёт последнюю страницу, которая дочитается при рендере.
+    """
+    if settings.POSTS_PAGINATION == "cursor" or "cursor" in request.GET:
+        paginator = CursorPaginator(post_list, POSTS_PER_PAGE)
+        cursor = request.GET.get("cursor")
+        return [lambda: paginator.get_page(cursor)], lambda page: page
+
+    paginator = CountingPaginator(
+        post_list, POSTS_PER_PAGE, cache_key=feed_key
+    )
+    number = _get_page_number(request)
+    bottom = (number - 1) * POSTS_PER_PAGE
+
+    def build(_count, items):
+        page = paginator.get_page(number)
+        if page.number == number:
+            page.object_list = items
+        return page
+
+    return [
+        lambda: paginator.count,
+        lambda: list(post_list[bottom:bottom + POSTS_PER_PAGE]),
+    ], build
+
+
+async def _cached(request, feed):
+    return await sync_to_async(get_cached_feed_page)(request, feed)
+
+
+async def _finish_feed(request, template_name, context):
+    response = await sync_to_async(render)(request, template_name, context)
+    return await sync_to_async(add_feed_expiry)(request, response)
+
+
+async def _serve_feed(request, feed, render_page, **kwargs):
+    """Страница ленты из кэша или, при промахе, ``render_page`` с записью.
+
+    В кэш попадает ответ уже с ETag/Last-Modified от ``conditional_page``.
+    """
+    response = await _cached(request, feed)
+    if response is None:
+        response = await render_page(request, **kwargs)
+        response = await sync_to_async(store_feed_page)(
+            request, feed, response
+        )
+    return response
+
+
+async def index(request):
+    return await _serve_feed(request, "index", _render_index)
+
+
+@conditional_page(get_index_state)
+async def _render_index(request):
+    post_list = get_posts_with_comments(
+        get_published_posts(
+            Post.objects.select_related("category", "author", "location")
+        )
+    )
+    loaders, build = get_page_loaders(request, post_list, feed_key="index")
+    page_obj = build(*await gather_queries(*loaders))
+    return await _finish_feed(
+        request, "blog/index.html", {"page_obj": page_obj}
+    )
+
+
+async def category_posts(request, slug):
+    return await _serve_feed(
+        request, f"category:{slug}", _render_category, slug=slug
+    )
+
+
+@conditional_page(get_category_state)
+async def _render_category(request, slug):
+    feed = f"category:{slug}"
+    post_list = get_posts_with_comments(
+        get_published_posts(
+            Post.objects.select_related(
+                "category", "author", "location"
+            ).filter(category__slug=slug)
+        )
+    )
+    loaders, build = get_page_loaders(request, post_list, feed_key=feed)
+    category, *results = await gather_queries(
+        lambda: Category.objects.filter(slug=slug, is_published=True).first(),
+        *loaders,
+    )
+    if category is None:
+        raise Http404("Категория не найдена или снята с публикации.")
+    context = {
+        "category": category,
+        "page_obj": build(*results),
+    }
+    return await _finish_feed(request, "blog/category.html", context)
+
+
+@conditional_page(get_post_state)
+async def post_detail(request, post_id):
+    post, comments = await gather_queries(
+        lambda: Post.objects.select_related(
+            "category", "author", "location"
+        ).filter(pk=post_id).first(),
+        lambda: get_post_comments(Post(pk=post_id)),
+    )
+    if post is None:
+        raise Http404("Публикация не найдена.")
+    is_author = await sync_to_async(lambda: request.user == post.author)()
+    if not is_author and (
+        (post.pub_date is not None and post.pub_date > timezone.now())
+        or not post.is_published
+        or (post.category is None or not post.category.is_published)
+    ):
+        raise Http404("Публикация не найдена или не опубликована.")
+    context = {
+        "post": post,
+        "comment_form": CommentForm(),
+        "comments": comments,
+    }
+    return await sync_to_async(render)(request, "blog/detail.html", context)
+
+
+async def profile_detail(request, username):
+    is_owner = await sync_to_async(
+        lambda: request.user.is_authenticated
+        and request.user.username == username
+    )()
+    # Автор выбирается JOIN'ом: профиль здесь не загружается отдельно
+    posts = Post.objects.select_related(
+        "category", "author", "location"
+    ).filter(author__username=username)
+    if is_owner:
+        visibility = "all"
+    else:
+        posts = get_published_posts(posts)
+        visibility = "published"
+    loaders, build = get_page_loaders(
+        request,
+        get_posts_with_comments(posts),
+        feed_key=f"author:{username}:{visibility}",
+    )
+    profile, *results = await gather_queries(
+        lambda: User.objects.filter(username=username).first(), *loaders
+    )
+    if profile is None:
+        raise Http404("Пользователь не найден.")
+    context = {
+        "profile": profile,
+        "page_obj": build(*results),
+    }
+    return await _finish_feed(request, "blog/profile.html", context)
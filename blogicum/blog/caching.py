@@ -0,0 +1,164 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import (
+    get_conditional_response,
+    patch_response_headers,
+    patch_vary_headers,
+)
+from django.utils.http import parse_http_date_safe
+
+from blogicum.replicas import is_reading_replica
+
+from .publication import get_seconds_to_horizon
+
+# «Поколение» всех лент: его смена сбрасывает кэш всех страниц сразу
+ALL_FEEDS = "*"
+# Отдельный кэш процесса для замеров: их cache.clear() не должен стирать
+# общий кэш сайта (см. settings_production)
+PRIVATE_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "blog-benchmark",
+    },
+}
+
+
+def _generation_key(feed):
+    return f"blog:feed:{feed}:generation"
+
+
+def _new_generation():
+    # Время сброса в начале значения: по нему считается Last-Modified
+    # ленты, и оно не идёт назад даже после удаления поста
+    return f"{int(time.time())}-{uuid4().hex}"
+
+
+def get_feed_generation(feed):
+    """Текущее «поколение» кэша ленты."""
+    return cache.get_or_set(_generation_key(feed), _new_generation, None)
+
+
+def get_feeds_state(*feeds):
+    """Поколения лент и время последнего сброса любой из них."""
+    generations = tuple(get_feed_generation(feed) for feed in feeds)
+    reset_at = max(
+        int(generation.rpartition("-")[0] or 0) for generation in generations
+    )
+    return generations, datetime.fromtimestamp(reset_at, timezone.utc)
+
+
+def invalidate_feeds(*feeds):
+    """Сбрасывает закэшированные страницы перечисленных лент."""
+    cache.set_many(
+        {_generation_key(feed): _new_generation() for feed in feeds}, None
+    )
+
+
+def get_feed_cache_timeout():
+    """Срок жизни страницы ленты в кэше.
+
+    Не дольше ``FEED_CACHE_TIMEOUT`` и не позже ближайшей отложенной
+    публикации, чтобы она появилась в ленте вовремя. Страница, прочитанная
+    с реплики, может не содержать записи, которая уже сменила поколение
+    ленты, поэтому живёт не дольше ``REPLICA_PIN_SECONDS`` — столько же,
+    сколько автор записи читает с основной базы.
+    """
+    timeout = settings.FEED_CACHE_TIMEOUT
+    if is_reading_replica():
+        timeout = min(timeout, settings.REPLICA_PIN_SECONDS)
+    return get_seconds_to_horizon(timeout)
+
+
+def add_feed_expiry(request, response):
+    """Проставляет ``Expires``/``max-age`` страницы ленты для анонимов.
+
+    Срок совпадает со сроком жизни страницы в кэше лент, а ``Vary: Cookie``
+    не даёт промежуточным кэшам отдать её вошедшему пользователю.
+    """
+    patch_vary_headers(response, ("Cookie",))
+    if not request.user.is_authenticated:
+        patch_response_headers(response, get_feed_cache_timeout())
+    return response
+
+
+def _is_cacheable(request):
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+    )
+
+
+def _get_page_params(request):
+    """Параметры запроса, от которых зависит страница ленты.
+
+    Прочие (``?utm=...``) в ключ не входят и не плодят копий страницы.
+    Номер страницы не из цифр пагинатор считает первой страницей.
+    """
+    page = request.GET.get("page")
+    page = str(int(page)) if page and page.isdigit() else None
+    return page, request.GET.get("cursor")
+
+
+def _get_page_key(request, feed):
+    # Переменная часть хэшируется: ключ не длиннее предела memcached
+    digest = hashlib.md5(
+        repr((feed, _get_page_params(request))).encode()
+    ).hexdigest()
+    return "blog:feed-page:{}:{}:{}".format(
+        get_feed_generation(ALL_FEEDS), get_feed_generation(feed), digest
+    )
+
+
+def get_cached_feed_page(request, feed):
+    """Готовый ответ из кэша лент или None.
+
+    Если клиент прислал валидаторы, совпадающие с ETag/Last-Modified
+    закэшированной страницы, вместо неё возвращается ``304``.
+    """
+    if not _is_cacheable(request):
+        return None
+    response = cache.get(_get_page_key(request, feed))
+    if response is None:
+        return None
+    return get_conditional_response(
+        request,
+        etag=response.get("ETag"),
+        last_modified=parse_http_date_safe(response.get("Last-Modified")),
+        response=response,
+    )
+
+
+def store_feed_page(request, feed, response):
+    """Кладёт успешный ответ анонимному посетителю в кэш лент."""
+    if _is_cacheable(request) and response.status_code == 200:
+        cache.set(
+            _get_page_key(request, feed), response, get_feed_cache_timeout()
+        )
+    return response
+
+
+def cache_feed_page(feed_template):
+    """Кэширует страницы ленты для анонимных посетителей.
+
+    Ключ ленты строится из ``feed_template`` и аргументов URL, например
+    ``"category:{slug}"``; в ключ страницы также входят параметры запроса
+    (номер страницы или курсор).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            feed = feed_template.format(**kwargs)
+            response = get_cached_feed_page(request, feed)
+            if response is None:
+                response = store_feed_page(
+                    request, feed, view(request, *args, **kwargs)
+                )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,164 @@
+"""Условные GET-запросы (ETag/Last-Modified) для страниц чтения.
+
+Валидаторы страницы считаются одним коротким запросом (для лент — ещё
+по поколениям их кэша), без рендеринга шаблона: если клиент прислал
+совпадающие ``If-None-Match`` или ``If-Modified-Since``, он сразу
+получает ``304 Not Modified``.
+
+Разметка страницы зависит от посетителя (кнопки автора, форма
+комментария, меню), поэтому в ETag входит id пользователя.
+"""
+import asyncio
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Max, OuterRef, Q, Subquery
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .caching import ALL_FEEDS, get_feeds_state
+from .models import Category, Post
+
+
+def _published_q(prefix=""):
+    """Условие видимости поста в ленте (как в ``get_published_posts``)."""
+    return (
+        Q(**{f"{prefix}pub_date__lte": timezone.now()})
+        | Q(**{f"{prefix}pub_date__isnull": True})
+    ) & Q(
+        **{
+            f"{prefix}is_published": True,
+            f"{prefix}category__is_published": True,
+        }
+    )
+
+
+def get_post_state(post_id):
+    """Время изменения поста и число его комментариев.
+
+    ``updated_at`` поста меняется и при записи его комментариев, поэтому
+    сами комментарии не читаются.
+    """
+    return Post.objects.filter(pk=post_id).aggregate(
+        modified=Max("updated_at"), comments=Max("comment_count")
+    )
+
+
+def _newest_posts():
+    # Одна строка по индексу ленты, без подсчёта всех постов
+    return Post.objects.filter(_published_q()).order_by("-pub_date", "-pk")
+
+
+def _feed_state(feeds, newest=None, published=None):
+    """Состояние ленты по её поколениям в кэше и самому новому посту.
+
+    Поколения меняются при любой записи, видной в ленте, а самый новый
+    пост — когда наступает время отложенной публикации. Last-Modified
+    берётся из времени сброса и даты этого поста, поэтому не идёт назад.
+    """
+    generations, reset_at = get_feeds_state(ALL_FEEDS, *feeds)
+    return {
+        "generations": generations,
+        "reset_at": reset_at,
+        "newest": newest,
+        "published": published,
+    }
+
+
+def get_index_state():
+    """Состояние главной ленты (см. ``_feed_state``)."""
+    newest = _newest_posts().values_list("pk", "pub_date").first()
+    return _feed_state(["index"], *newest or ())
+
+
+def get_category_state(slug):
+    """То же для ленты категории; пустое состояние, если она скрыта."""
+    newest = _newest_posts().filter(category=OuterRef("pk"))[:1]
+    category = (
+        Category.objects.filter(slug=slug, is_published=True)
+        .annotate(
+            newest=Subquery(newest.values("pk")),
+            published=Subquery(newest.values("pub_date")),
+        )
+        .values("newest", "published")
+        .first()
+    )
+    if category is None:
+        return {}
+    return _feed_state([f"category:{slug}"], **category)
+
+
+def get_validators(request, state):
+    """Возвращает ETag и Last-Modified страницы по состоянию её данных.
+
+    (None, None) — если данных нет (например, пост не найден) —
+    тогда страница рендерится как обычно.
+    """
+    timestamps = [
+        value for value in state.values() if hasattr(value, "timestamp")
+    ]
+    if not timestamps:
+        return None, None
+    key = repr((sorted(state.items()), request.user.pk))
+    etag = quote_etag(hashlib.md5(key.encode()).hexdigest())
+    return etag, int(max(timestamps).timestamp())
+
+
+def _conditional(request, etag, last_modified, response=None):
+    if response is None:
+        return get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+    if response.status_code != 200:
+        return response
+    if etag is not None and not response.has_header("ETag"):
+        response["ETag"] = etag
+    if last_modified is not None and not response.has_header(
+        "Last-Modified"
+    ):
+        response["Last-Modified"] = http_date(last_modified)
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def conditional_page(get_state):
+    """Отвечает ``304``, если данные страницы не менялись.
+
+    ``get_state`` получает аргументы URL и возвращает словарь состояния
+    (см. ``get_post_state``). Подходит и для синхронных, и для
+    асинхронных представлений.
+    """
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method not in ("GET", "HEAD"):
+                    return await view(request, *args, **kwargs)
+                etag, last_modified = await sync_to_async(
+                    lambda: get_validators(request, get_state(**kwargs))
+                )()
+                response = _conditional(request, etag, last_modified)
+                if response is None:
+                    response = _conditional(
+                        request, etag, last_modified,
+                        await view(request, *args, **kwargs),
+                    )
+                return response
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+            etag, last_modified = get_validators(request, get_state(**kwargs))
+            response = _conditional(request, etag, last_modified)
+            if response is None:
+                response = _conditional(
+                    request, etag, last_modified,
+                    view(request, *args, **kwargs),
+                )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,87 @@
+"""Потоковая выгрузка публикаций и комментариев в NDJSON и CSV."""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post
+
+# Колонки выгрузки: имя в файле -> путь к полю для values_list()
+POST_COLUMNS = {
+    "id": "pk",
+    "title": "title",
+    "text": "text",
+    "pub_date": "pub_date",
+    "is_published": "is_published",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "author": "author__username",
+    "category": "category__slug",
+    "location": "location__name",
+    "comment_count": "comment_count",
+}
+COMMENT_COLUMNS = {
+    "id": "pk",
+    "post_id": "post_id",
+    "author": "author__username",
+    "text": "text",
+    "created_at": "created_at",
+}
+EXPORTS = {
+    "posts": (Post, POST_COLUMNS),
+    "comments": (Comment, COMMENT_COLUMNS),
+}
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson; charset=utf-8",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(kind, chunk_size=None, using=None):
+    """Перебирает строки выгрузки ``kind`` как словари колонок.
+
+    Строки читаются с сервера пачками по ``chunk_size`` через
+    ``.iterator()``, без кэша выборки, поэтому память не растёт
+    с размером таблицы.
+    """
+    model, columns = EXPORTS[kind]
+    queryset = model._base_manager.using(using).order_by("pk").values_list(
+        *columns.values()
+    )
+    names = tuple(columns)
+    for values in queryset.iterator(
+        chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE
+    ):
+        yield dict(zip(names, values))
+
+
+def iter_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def iter_csv(rows, columns):
+    writer = csv.DictWriter(_Echo(), fieldnames=list(columns))
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_export(kind, export_format, chunk_size=None, using=None):
+    """Строки файла выгрузки ``kind`` в формате ``export_format``."""
+    if kind not in EXPORTS:
+        raise ValueError(f"Неизвестная выгрузка: {kind}.")
+    rows = iter_rows(kind, chunk_size, using)
+    if export_format == "ndjson":
+        return iter_ndjson(rows)
+    if export_format == "csv":
+        return iter_csv(rows, EXPORTS[kind][1])
+    raise ValueError(f"Неизвестный формат: {export_format}.")
@@ -0,0 +1,214 @@
+"""Фоновая обработка картинок постов.
+
+После сохранения поста с новой картинкой (и фиксации транзакции) в
+очередь ставится задание; пул рабочих потоков делает уменьшенные копии
+вне обработки запроса и отмечает пост флагом ``images_ready``.
+
+Очередь подключаемая, её класс задаётся в ``IMAGE_QUEUE["BACKEND"]``:
+
+* ``MemoryQueue`` — очередь в памяти процесса;
+* ``DatabaseQueue`` — таблица ``ImageJob``: задания переживают
+  перезапуск, и их может разбирать отдельный процесс
+  (``manage.py process_image_jobs``).
+"""
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections, transaction
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ImageJob, Post
+from .thumbnails import generate_thumbnails
+
+logger = logging.getLogger(__name__)
+
+Job = namedtuple("Job", ["post_id", "image", "token"])
+
+
+class MemoryQueue:
+    """Очередь заданий в памяти; при перезапуске процесса они теряются."""
+
+    def __init__(self, **options):
+        self._queue = queue.Queue()
+
+    def put(self, post_id, image):
+        self._queue.put(Job(post_id, image, None))
+
+    def get(self, timeout=None):
+        """Следующее задание или None, если за ``timeout`` его не было."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def done(self, job):
+        self._queue.task_done()
+
+    def join(self):
+        """Ждёт, пока все поставленные задания будут обработаны."""
+        self._queue.join()
+
+
+class DatabaseQueue:
+    """Очередь заданий в таблице ``ImageJob``.
+
+    Задание «берётся» условным UPDATE по ``started_at``, поэтому его не
+    получат два обработчика сразу, даже из разных процессов. Задание,
+    взятое дольше ``STALE_AFTER`` секунд назад, считается брошенным
+    (обработчик упал) и выдаётся снова.
+    """
+
+    poll_interval = 1
+
+    def __init__(self, **options):
+        self.stale_after = timedelta(seconds=options.get("STALE_AFTER", 600))
+
+    def put(self, post_id, image):
+        ImageJob.objects.create(post_id=post_id, image=image)
+
+    def _claim(self):
+        now = timezone.now()
+        available = ImageJob.objects.filter(started_at__isnull=True) | (
+            ImageJob.objects.filter(started_at__lt=now - self.stale_after)
+        )
+        for job in available.order_by("pk")[:10]:
+            claimed = ImageJob.objects.filter(
+                pk=job.pk, started_at=job.started_at
+            ).update(started_at=now)
+            if claimed:
+                return Job(job.post_id, job.image, job.pk)
+        return None
+
+    def get(self, timeout=None):
+        """Следующее задание; без заданий опрашивает таблицу до ``timeout``."""
+        deadline = None if timeout is None else (
+            timezone.now() + timedelta(seconds=timeout)
+        )
+        while True:
+            job = self._claim()
+            if job is not None:
+                return job
+            if deadline is not None and timezone.now() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def done(self, job):
+        ImageJob.objects.filter(pk=job.token).delete()
+
+
+def process_job(job):
+    """Делает копии картинки и отмечает пост, если картинка не сменилась."""
+    post = Post.objects.filter(pk=job.post_id, image=job.image).first()
+    if post is None:  # Пост удалён или картинку уже заменили
+        return False
+    generate_thumbnails(post.image)
+    post.images_ready = True
+    # Через save(), чтобы сигналы сбросили кэш лент и версию карточки
+    post.save(update_fields=["images_ready", "updated_at"])
+    return True
+
+
+class WorkerPool:
+    """Пул потоков, разбирающих очередь картинок.
+
+    Pillow отпускает GIL на время сжатия и перекодирования, поэтому
+    потоков хватает, чтобы обработка не ждала запросы и наоборот.
+    """
+
+    def __init__(self, job_queue, workers):
+        self.queue = job_queue
+        self.workers = workers
+        self._threads = []
+        self._stopping = threading.Event()
+
+    def _handle(self, job):
+        close_old_connections()
+        try:
+            process_job(job)
+        except Exception:
+            logger.exception("Не удалось обработать картинку %s", job.image)
+        finally:
+            self.queue.done(job)
+            close_old_connections()
+
+    def run_once(self, timeout=0):
+        """Обрабатывает одно задание в текущем потоке; False — заданий нет."""
+        job = self.queue.get(timeout=timeout)
+        if job is None:
+            return False
+        self._handle(job)
+        return True
+
+    def drain(self):
+        """Обрабатывает все ожидающие задания в текущем потоке."""
+        processed = 0
+        while self.run_once():
+            processed += 1
+        return processed
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.run_once(timeout=1)
+
+    def start(self):
+        for number in range(self.workers - len(self._threads)):
+            thread = threading.Thread(
+                target=self._run, name=f"image-worker-{number}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+        self._stopping.clear()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Пул обработчиков текущего процесса по настройке ``IMAGE_QUEUE``."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            options = dict(settings.IMAGE_QUEUE)
+            backend = import_string(options.pop("BACKEND"))
+            workers = options.pop("WORKERS", 0)
+            _pool = WorkerPool(backend(**options), workers)
+        return _pool
+
+
+@receiver(setting_changed)
+def reset_worker_pool(setting, **kwargs):
+    global _pool
+    if setting == "IMAGE_QUEUE" and _pool is not None:
+        _pool.stop()
+        _pool = None
+
+
+def enqueue_image(post):
+    """Ставит картинку поста в очередь после фиксации транзакции.
+
+    При ``WORKERS = 0`` процесс только ставит задания, а разбирает их
+    ``manage.py process_image_jobs``.
+    """
+    post_id, image = post.pk, post.image.name
+
+    def put():
+        pool = get_worker_pool()
+        pool.queue.put(post_id, image)
+        pool.start()
+
+    transaction.on_commit(put)
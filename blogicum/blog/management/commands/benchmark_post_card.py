@@ -0,0 +1,62 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+from django.test import override_settings
+
+from blog.caching import PRIVATE_CACHES
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Сравнивает время рендера карточек постов без кэша фрагментов "
+        "и с прогретым кэшем."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=10,
+            help="Сколько карточек на странице (как в ленте).",
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=200,
+            help="Сколько раз отрисовать страницу карточек.",
+        )
+
+    def _render_page(self, posts):
+        template = self.template
+        for post in posts:
+            template.render({"post": post})
+
+    def _measure(self, posts, rounds, warm):
+        timings = []
+        for _ in range(rounds):
+            if not warm:
+                cache.clear()
+            started = time.perf_counter()
+            self._render_page(posts)
+            timings.append(time.perf_counter() - started)
+        return sum(timings) / len(timings) * 1000
+
+    @override_settings(CACHES=PRIVATE_CACHES)
+    def handle(self, *args, posts, rounds, **options):
+        page = list(
+            Post.objects.select_related("category", "author", "location")
+            .order_by("-pub_date")[:posts]
+        )
+        if not page:
+            raise CommandError("В базе нет публикаций для замера.")
+        # Шаблон загружаем один раз, чтобы мерить рендер, а не чтение с диска
+        self.template = get_template("includes/post_card.html")
+        self._render_page(page)
+        cold = self._measure(page, rounds, warm=False)
+        self._render_page(page)
+        warm = self._measure(page, rounds, warm=True)
+        self.stdout.write(
+            f"Карточек на странице: {len(page)}, повторов: {rounds}\n"
+            f"Без кэша фрагментов: {cold:.3f} мс на страницу\n"
+            f"С прогретым кэшем:   {warm:.3f} мс на страницу\n"
+            f"Ускорение: {cold / warm:.1f}x"
+        )
@@ -0,0 +1,211 @@
+import json
+import statistics
+import time
+from io import StringIO
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+import blog.urls
+import pages.urls
+from blog.caching import PRIVATE_CACHES
+from blog.models import Comment, Post
+from blogicum.query_budget import QueryStats
+
+# Маршруты для замера: все именованные из этих модулей
+ROUTE_MODULES = (blog.urls, pages.urls)
+# Параметры строки запроса маршрутов, которым без них нечего показывать
+ROUTE_QUERIES = {"blog:search": "?q=жираф"}
+
+
+def iter_routes():
+    """Имена маршрутов (``blog:index``) и имена их параметров."""
+    for module in ROUTE_MODULES:
+        for pattern in module.urlpatterns:
+            if pattern.name:
+                yield (
+                    f"{module.app_name}:{pattern.name}",
+                    sorted(pattern.pattern.converters),
+                )
+
+
+def seed(posts, comments_per_post, seed_value):
+    """Наполняет пустую базу командой generate_data.
+
+    Данные зависят только от параметров, поэтому результаты замеров
+    разных коммитов сравнимы. Возвращает пользователя, от имени которого
+    идут запросы (сотрудника), и значения параметров маршрутов: его
+    самый обсуждаемый видимый пост и его комментарий к этому посту.
+    """
+    call_command(
+        "generate_data",
+        users=max(posts // 20, 1),
+        categories=10,
+        locations=10,
+        posts=posts,
+        comments=posts * comments_per_post,
+        seed=seed_value,
+        stdout=StringIO(),
+    )
+    post = (
+        Post.objects.filter(
+            is_published=True,
+            category__is_published=True,
+            pub_date__lte=timezone.now(),
+        )
+        .select_related("author", "category")
+        .order_by("-comment_count", "pk")
+        .first()
+    )
+    comment = post.comments.order_by("pk").first() if post else None
+    if comment is None:
+        raise CommandError("Мало данных: нужен видимый пост с комментарием.")
+    user = post.author
+    user.is_staff = True  # Выгрузка доступна только сотрудникам
+    user.save(update_fields=["is_staff"])
+    Comment.objects.filter(pk=comment.pk).update(author=user)
+    return user, {
+        "post_id": post.pk,
+        "comment_id": comment.pk,
+        "slug": post.category.slug,
+        "username": user.username,
+        "kind": "posts",
+    }
+
+
+def measure(client, url, requests, warmup):
+    """Задержки GET-запросов к ``url`` и число SQL-запросов на запрос."""
+    latencies = []
+    queries = 0
+    for number in range(warmup + requests):
+        stats = QueryStats()
+        started = time.perf_counter()
+        with connections[DEFAULT_DB_ALIAS].execute_wrapper(stats):
+            response = client.get(url)
+            if response.streaming:  # Выгрузка формируется при чтении
+                for _chunk in response.streaming_content:
+                    pass
+        if number >= warmup:
+            latencies.append(time.perf_counter() - started)
+            queries = max(queries, stats.count)
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "url": url,
+        "status": response.status_code,
+        "queries": queries,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(percentiles[94] * 1000, 3),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Замеряет задержку (p50/p95) и число SQL-запросов GET-запроса к "
+        "каждому именованному маршруту blog и pages на синтетических "
+        "данных во временной тестовой базе и выводит результат в JSON "
+        "для сравнения между коммитами."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--posts", type=int, default=2000,
+            help="Сколько публикаций создать.",
+        )
+        parser.add_argument(
+            "--comments-per-post", type=int, default=5,
+            help=(
+                "Сколько комментариев в среднем на публикацию (по "
+                "публикациям они распределены неравномерно)."
+            ),
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Зерно генератора данных.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=50,
+            help="Сколько замеров на маршрут.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5,
+            help="Сколько запросов на маршрут сделать до замеров.",
+        )
+        parser.add_argument(
+            "--route", action="append", dest="routes",
+            help="Замерить только этот маршрут (можно несколько раз).",
+        )
+        parser.add_argument(
+            "--output",
+            help="Файл для результата (по умолчанию — stdout).",
+        )
+        parser.add_argument(
+            "--no-test-database", action="store_false",
+            dest="test_database",
+            help=(
+                "Не создавать тестовую базу, а наполнять настроенную "
+                "(только для пустой одноразовой базы)."
+            ),
+        )
+
+    def _run(self, options):
+        cache.clear()
+        user, route_kwargs = seed(
+            options["posts"], options["comments_per_post"], options["seed"]
+        )
+        # Сломанный маршрут попадает в отчёт со статусом 500
+        client = Client(raise_request_exception=False)
+        client.force_login(user)
+        results = {}
+        for name, params in iter_routes():
+            if options["routes"] and name not in options["routes"]:
+                continue
+            url = reverse(
+                name, kwargs={param: route_kwargs[param] for param in params}
+            ) + ROUTE_QUERIES.get(name, "")
+            results[name] = measure(
+                client, url, options["requests"], options["warmup"]
+            )
+        return results
+
+    def handle(self, *args, **options):
+        if options["requests"] < 2:
+            raise CommandError("Для перцентилей нужно хотя бы 2 замера.")
+        connection = connections[DEFAULT_DB_ALIAS]
+        if options["test_database"]:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, serialize=False
+            )
+        try:
+            with override_settings(
+                DEBUG=False,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+                CACHES=PRIVATE_CACHES,
+            ):
+                routes = self._run(options)
+        finally:
+            if options["test_database"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        report = {
+            "settings": {
+                "posts": options["posts"],
+                "comments_per_post": options["comments_per_post"],
+                "seed": options["seed"],
+                "requests": options["requests"],
+                "database": connection.vendor,
+                "async_views": settings.BLOG_ASYNC_VIEWS,
+            },
+            "routes": routes,
+        }
+        output = json.dumps(report, ensure_ascii=False, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as file:
+                file.write(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,131 @@
+import gzip
+from collections import defaultdict
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from blog.caching import ALL_FEEDS, invalidate_feeds
+from blog.models import Comment, Post
+from blog.paginators import invalidate_post_counts
+from blog.publication import reset_publication_horizon
+from blog.search import rebuild_index
+from blog.streaming import iter_json_array
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает JSON-фикстуру Django потоково: объекты читаются по "
+        "одному и вставляются пачками по моделям в одной транзакции. "
+        "Объекты только добавляются, поэтому их таблицы должны быть пусты."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture", help="Путь к .json или .json.gz.")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Сколько объектов одной модели вставлять за раз.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="База данных для загрузки.",
+        )
+        parser.add_argument(
+            "--ignorenonexistent", "-i", action="store_true",
+            help="Пропускать поля, которых нет в моделях.",
+        )
+        parser.add_argument(
+            "--skip-recount", action="store_true",
+            help="Не пересчитывать Post.comment_count после загрузки.",
+        )
+
+    def _open(self, path):
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8")
+        return open(path, encoding="utf-8")
+
+    def _flush(self, model, batch):
+        """Вставляет пачку как есть (raw), не трогая auto_now-поля."""
+        connection = connections[self.using]
+        fields = list(model._meta.concrete_fields)
+        objects = [deserialized.object for deserialized in batch]
+        size = connection.ops.bulk_batch_size(fields, objects) or len(objects)
+        manager = model._base_manager.using(self.using)
+        for start in range(0, len(objects), size):
+            manager._insert(
+                objects[start:start + size],
+                fields=fields,
+                using=self.using,
+                raw=True,
+            )
+        for deserialized in batch:
+            for name, values in (deserialized.m2m_data or {}).items():
+                getattr(deserialized.object, name).set(values)
+        self.counts[model] += len(objects)
+        batch.clear()
+
+    def _load(self, stream, options):
+        """Читает фикстуру и вставляет объекты пачками по моделям."""
+        buffers = defaultdict(list)
+        deferred = []
+        objects = Deserializer(
+            iter_json_array(stream),
+            using=self.using,
+            ignorenonexistent=options["ignorenonexistent"],
+            handle_forward_references=True,
+        )
+        for deserialized in objects:
+            if deserialized.deferred_fields:
+                deferred.append(deserialized)
+            model = type(deserialized.object)
+            buffers[model].append(deserialized)
+            if len(buffers[model]) >= options["batch_size"]:
+                self._flush(model, buffers[model])
+        for model, batch in buffers.items():
+            if batch:
+                self._flush(model, batch)
+        for deserialized in deferred:
+            deserialized.save_deferred_fields(using=self.using)
+
+    def _finish(self, connection):
+        """Проверяет внешние ключи и сдвигает последовательности id."""
+        connection.check_constraints(
+            table_names=[model._meta.db_table for model in self.counts]
+        )
+        sequence_sql = connection.ops.sequence_reset_sql(
+            no_style(), list(self.counts)
+        )
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+    def handle(self, *args, fixture, database, **options):
+        self.using = database
+        self.counts = defaultdict(int)
+        connection = connections[database]
+        with self._open(fixture) as stream, transaction.atomic(
+            using=database
+        ):
+            with connection.constraint_checks_disabled():
+                self._load(stream, options)
+            self._finish(connection)
+
+        # Сигналы при массовой вставке не срабатывают — сбрасываем кэши сами
+        invalidate_feeds(ALL_FEEDS)
+        invalidate_post_counts()
+        reset_publication_horizon()
+        if Comment in self.counts and not options["skip_recount"]:
+            call_command("recount_comments", database=database)
+        if Post in self.counts:
+            rebuild_index(using=database)
+
+        for model, count in self.counts.items():
+            self.stdout.write(f"{model._meta.label}: {count}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено объектов: {sum(self.counts.values())}"
+            )
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.exports import CONTENT_TYPES, EXPORTS, iter_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоково выгружает публикации или комментарии в NDJSON или CSV, "
+        "не загружая таблицу в память целиком."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "kind", nargs="?", default="posts", choices=sorted(EXPORTS),
+            help="Что выгружать.",
+        )
+        parser.add_argument(
+            "--format", dest="export_format", default="ndjson",
+            choices=sorted(CONTENT_TYPES),
+            help="Формат выгрузки.",
+        )
+        parser.add_argument(
+            "--output", "-o",
+            help="Файл для выгрузки (по умолчанию — стандартный вывод).",
+        )
+        parser.add_argument(
+            "--chunk-size", type=int,
+            help="Сколько строк читать из базы за раз.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="База данных для выгрузки.",
+        )
+
+    def handle(
+        self, *args, kind, export_format, output, chunk_size, database,
+        **options
+    ):
+        lines = iter_export(kind, export_format, chunk_size, database)
+        if output is None:
+            for line in lines:
+                self.stdout.write(line, ending="")
+            return
+        try:
+            stream = open(output, "w", encoding="utf-8", newline="")
+        except OSError as error:
+            raise CommandError(error)
+        with stream:
+            stream.writelines(lines)
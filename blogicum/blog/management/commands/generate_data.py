@@ -0,0 +1,118 @@
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from blog.caching import ALL_FEEDS, invalidate_feeds
+from blog.paginators import invalidate_post_counts
+from blog.publication import reset_publication_horizon
+from blog.synthetic import DataGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        "Генерирует синтетических пользователей, категории, места, посты "
+        "и комментарии пачками через bulk_create. При одинаковом --seed "
+        "данные одинаковые; память не растёт с числом комментариев."
+    )
+
+    def add_arguments(self, parser):
+        counts = (
+            ("--users", 1000, "Сколько пользователей создать."),
+            ("--categories", 20, "Сколько категорий создать."),
+            ("--locations", 50, "Сколько мест создать."),
+            ("--posts", 10_000, "Сколько публикаций создать."),
+            ("--comments", 100_000, "Сколько комментариев создать."),
+        )
+        for option, default, help_text in counts:
+            parser.add_argument(
+                option, type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            "--seed", type=int, default=0,
+            help="Зерно генератора: одинаковое зерно — одинаковые данные.",
+        )
+        parser.add_argument(
+            "--unpublished", type=float, default=0.05,
+            help="Доля публикаций, снятых с публикации.",
+        )
+        parser.add_argument(
+            "--future", type=float, default=0.02,
+            help="Доля отложенных публикаций (дата в будущем).",
+        )
+        parser.add_argument(
+            "--hidden-categories", type=float, default=0.1,
+            help="Доля категорий, снятых с публикации.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365,
+            help="За сколько дней распределить даты публикаций.",
+        )
+        parser.add_argument(
+            "--skew", type=float, default=1.0,
+            help=(
+                "Показатель распределения Ципфа для комментариев: "
+                "0 — поровну, больше — сильнее перекос к популярным постам."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=5000,
+            help="Сколько объектов вставлять за раз.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="База данных для генерации.",
+        )
+
+    def _report(self, label, count):
+        if self.verbosity > 1:
+            self.stdout.write(f"{label}: {count}")
+
+    def handle(self, *args, database, **options):
+        if options["posts"] and not (
+            options["users"] and options["categories"]
+        ):
+            raise CommandError(
+                "Для публикаций нужны хотя бы один пользователь и категория."
+            )
+        if options["comments"] and not options["posts"]:
+            raise CommandError("Для комментариев нужны публикации.")
+        self.verbosity = options["verbosity"]
+        generator = DataGenerator(
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            using=database,
+            report=self._report,
+        )
+        generator.users(options["users"])
+        generator.categories(
+            options["categories"], hidden=options["hidden_categories"]
+        )
+        generator.locations(options["locations"])
+        generator.posts(
+            options["posts"],
+            unpublished=options["unpublished"],
+            future=options["future"],
+            days=options["days"],
+        )
+        generator.comments(options["comments"], skew=options["skew"])
+
+        # Сигналы при bulk_create не срабатывают: счётчики, индекс и кэши
+        # приводим в порядок сами
+        invalidate_feeds(ALL_FEEDS)
+        invalidate_post_counts()
+        reset_publication_horizon()
+        if options["comments"]:
+            call_command(
+                "recount_comments", database=database, stdout=self.stdout
+            )
+        if options["posts"]:
+            call_command(
+                "rebuild_search_index", database=database, stdout=self.stdout
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Создано: пользователей {users}, категорий {categories}, "
+                "мест {locations}, публикаций {posts}, "
+                "комментариев {comments}".format(**options)
+            )
+        )
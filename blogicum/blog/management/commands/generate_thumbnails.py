@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog.caching import ALL_FEEDS, invalidate_feeds
+from blog.models import Post
+from blog.thumbnails import iter_thumbnail_names, safe_generate_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Создаёт уменьшенные копии картинок постов, загруженных до "
+        "появления копий или после смены THUMBNAIL_SIZES."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Пересоздать копии, даже если они уже есть.",
+        )
+
+    def handle(self, *args, force, **options):
+        posts = (
+            Post.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .only("pk", "image", "images_ready")
+            .order_by("pk")
+        )
+        generated = 0
+        for post in posts.iterator():
+            storage = post.image.storage
+            if not force and post.images_ready and all(
+                storage.exists(name)
+                for name in iter_thumbnail_names(post.image.name)
+            ):
+                continue
+            if safe_generate_thumbnails(post.image):
+                Post.objects.filter(pk=post.pk).update(
+                    images_ready=True, updated_at=timezone.now()
+                )
+                generated += 1
+        if generated:
+            invalidate_feeds(ALL_FEEDS)
+        self.stdout.write(
+            self.style.SUCCESS(f"Обновлены копии картинок постов: {generated}")
+        )
@@ -0,0 +1,101 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+
+from blog.models import Category, Post
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Нагрузочный тест страниц чтения через WSGI- или ASGI-обработчик. "
+        "Для сравнения с асинхронными страницами запустите вариант asgi "
+        "с переменной окружения BLOG_ASYNC_VIEWS=1."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--handler", choices=("wsgi", "asgi"), default="wsgi",
+            help="Через какой обработчик гонять запросы.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=500,
+            help="Всего запросов.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=20,
+            help="Сколько запросов выполнять одновременно.",
+        )
+        parser.add_argument(
+            "--url", action="append", dest="urls",
+            help="Адрес для теста (можно указать несколько раз).",
+        )
+
+    def _default_urls(self):
+        post = Post.objects.filter(is_published=True).first()
+        category = Category.objects.filter(is_published=True).first()
+        author = User.objects.filter(posts__isnull=False).first()
+        if not (post and category and author):
+            raise CommandError(
+                "В базе нет данных для теста; передайте адреса через --url."
+            )
+        return [
+            "/",
+            f"/category/{category.slug}/",
+            f"/posts/{post.pk}/",
+            f"/profile/{author.username}/",
+        ]
+
+    def _run_wsgi(self, urls, concurrency):
+        def fetch(url):
+            started = time.perf_counter()
+            status = Client().get(url).status_code
+            return status, time.perf_counter() - started
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(fetch, urls))
+
+    async def _run_asgi(self, urls, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        client = AsyncClient()
+
+        async def fetch(url):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(url)
+                return response.status_code, time.perf_counter() - started
+
+        return await asyncio.gather(*(fetch(url) for url in urls))
+
+    def handle(self, *args, handler, requests, concurrency, urls, **options):
+        urls = list(islice(cycle(urls or self._default_urls()), requests))
+        with override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+        ):
+            started = time.perf_counter()
+            if handler == "wsgi":
+                results = self._run_wsgi(urls, concurrency)
+            else:
+                results = asyncio.run(self._run_asgi(urls, concurrency))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for _status, latency in results)
+        errors = sum(1 for status, _latency in results if status >= 400)
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f"Обработчик: {handler}, асинхронные страницы: "
+            f"{'да' if settings.BLOG_ASYNC_VIEWS else 'нет'}\n"
+            f"Запросов: {len(results)}, одновременно: {concurrency}, "
+            f"ошибок: {errors}\n"
+            f"Пропускная способность: {len(results) / elapsed:.1f} запр/с\n"
+            f"Задержка p50: {percentiles[49] * 1000:.1f} мс, "
+            f"p95: {percentiles[94] * 1000:.1f} мс"
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from blog.image_queue import get_worker_pool
+
+
+class Command(BaseCommand):
+    help = (
+        "Разбирает очередь обработки картинок постов отдельным процессом "
+        "(нужно для IMAGE_QUEUE с DatabaseQueue и WORKERS = 0)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Обработать ожидающие задания и выйти.",
+        )
+
+    def handle(self, *args, once, **options):
+        pool = get_worker_pool()
+        if once:
+            processed = pool.drain()
+            self.stdout.write(
+                self.style.SUCCESS(f"Обработано заданий: {processed}")
+            )
+            return
+        self.stdout.write("Обработка картинок запущена, Ctrl+C — выход.")
+        try:
+            while True:
+                pool.run_once(timeout=None)
+        except KeyboardInterrupt:
+            pass
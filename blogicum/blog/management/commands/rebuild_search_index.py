@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from blog.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Перестраивает полнотекстовый индекс публикаций."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Сколько публикаций читать из базы за раз.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="База данных с индексом.",
+        )
+
+    def handle(self, *args, batch_size, database, **options):
+        with transaction.atomic(using=database):
+            total = rebuild_index(batch_size, using=database)
+        self.stdout.write(
+            self.style.SUCCESS(f"Проиндексировано публикаций: {total}")
+        )
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = "Пересчитывает Post.comment_count по таблице комментариев."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10_000,
+            help="Сколько публикаций обновлять одним запросом.",
+        )
+        parser.add_argument(
+            "--database", default=DEFAULT_DB_ALIAS,
+            help="База данных для пересчёта.",
+        )
+
+    def handle(self, *args, batch_size, database, **options):
+        comment_count = Subquery(
+            Comment.objects.using(database).filter(post=OuterRef("pk"))
+            .order_by()
+            .values("post")
+            .annotate(total=Count("pk"))
+            .values("total"),
+            output_field=IntegerField(),
+        )
+        updated = 0
+        last_pk = 0
+        while True:
+            bounds = list(
+                Post.objects.using(database).filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not bounds:
+                break
+            with transaction.atomic(using=database):
+                updated += Post.objects.using(database).filter(
+                    pk__gte=bounds[0], pk__lte=bounds[-1]
+                ).update(comment_count=Coalesce(comment_count, 0))
+            last_pk = bounds[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"Пересчитано публикаций: {updated}")
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blogicum.templates_warmup import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Загружает и компилирует все шаблоны проекта; при ошибке разбора "
+        "завершается с ошибкой (удобно для проверки перед выкладкой)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--include-apps",
+            action="store_true",
+            help="Также загрузить шаблоны приложений (admin и др.).",
+        )
+
+    def handle(self, *args, include_apps, **options):
+        started = time.perf_counter()
+        loaded, errors = warm_templates(include_apps=include_apps)
+        elapsed = (time.perf_counter() - started) * 1000
+        for name, error in errors.items():
+            self.stderr.write(f"{name}: {error}")
+        if errors:
+            raise CommandError(f"Шаблонов с ошибками: {len(errors)}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Загружено шаблонов: {loaded} за {elapsed:.0f} мс"
+            )
+        )
@@ -0,0 +1,105 @@
+# Generated by Django 3.2.16 on 2026-10-18 12:00
+
+import posixpath
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Копии картинок на момент этой миграции: размеры и расширения форматов
+THUMBNAIL_SIZES = ("card", "detail")
+THUMBNAIL_EXTENSIONS = ("webp", "jpg")
+
+
+def mark_existing_images(apps, schema_editor):
+    """Отмечает готовыми картинки, у которых уже есть все копии.
+
+    Копии здесь не создаются: для остальных картинок после выкладки
+    запускается ``manage.py generate_thumbnails``.
+    """
+    Post = apps.get_model("blog", "Post")
+    posts = (
+        Post.objects.using(schema_editor.connection.alias)
+        .exclude(image="")
+        .exclude(image__isnull=True)
+        .only("pk", "image")
+        .order_by("pk")
+    )
+    ready = []
+    for post in posts.iterator():
+        root = posixpath.splitext(post.image.name)[0]
+        if all(
+            post.image.storage.exists(f"{root}.{size}.{extension}")
+            for size in THUMBNAIL_SIZES
+            for extension in THUMBNAIL_EXTENSIONS
+        ):
+            ready.append(post.pk)
+    for start in range(0, len(ready), 500):
+        Post.objects.using(schema_editor.connection.alias).filter(
+            pk__in=ready[start:start + 500]
+        ).update(images_ready=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0006_post_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="images_ready",
+            field=models.BooleanField(
+                default=False,
+                editable=False,
+                verbose_name="Копии картинки готовы",
+            ),
+        ),
+        migrations.RunPython(
+            mark_existing_images, migrations.RunPython.noop, elidable=True
+        ),
+        migrations.CreateModel(
+            name="ImageJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "image",
+                    models.CharField(max_length=255, verbose_name="Картинка"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Добавлено"
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        null=True, verbose_name="Взято в работу"
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="image_jobs",
+                        to="blog.post",
+                        verbose_name="Публикация",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "задание обработки картинки",
+                "verbose_name_plural": "Задания обработки картинок",
+                "ordering": ["pk"],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from blog.search import create_index_table, index_posts
+
+    create_index_table(schema_editor.connection)
+    Post = apps.get_model("blog", "Post")
+    index_posts(
+        Post.objects.using(schema_editor.connection.alias).only(
+            "pk", "title", "text"
+        ).iterator(),
+        using=schema_editor.connection.alias,
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    from blog.search import drop_index_table
+
+    drop_index_table(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_images_ready_imagejob"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -95,7 +95,18 @@ class Post(models.Model):
         blank=True,
         null=True,
     )
+    comment_count = models.PositiveIntegerField(
+        "Количество комментариев",
+        default=0,
+        editable=False,  # Поддерживается сигналами при записи комментариев
+    )
+    images_ready = models.BooleanField(
+        "Копии картинки готовы",
+        default=False,
+        editable=False,  # Выставляется фоновой обработкой картинки
+    )
     created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+    updated_at = models.DateTimeField("Изменено", auto_now=True)
 
     class Meta:
         verbose_name = "публикация"
@@ -103,6 +114,25 @@ class Post(models.Model):
         ordering = [
             "-pub_date"
         ]  # По умолчанию сортируем по дате публикации (от новых к старым)
+        indexes = [
+            # Главная лента: опубликованные посты по дате
+            models.Index(
+                fields=["-pub_date", "-id"],
+                name="post_published_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Лента категории
+            models.Index(
+                fields=["category", "-pub_date", "-id"],
+                name="post_category_feed_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Профиль автора (включая неопубликованные для владельца)
+            models.Index(
+                fields=["author", "-pub_date", "-id"],
+                name="post_author_feed_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
@@ -133,3 +163,25 @@ class Comment(models.Model):
 
     def __str__(self):
         return self.text[:15]  # Первые 15 символов текста комментария
+
+
+class ImageJob(models.Model):
+    """Задание на обработку картинки поста в очереди ``DatabaseQueue``."""
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="image_jobs",
+        verbose_name="Публикация",
+    )
+    image = models.CharField("Картинка", max_length=255)
+    created_at = models.DateTimeField("Добавлено", auto_now_add=True)
+    started_at = models.DateTimeField("Взято в работу", null=True)
+
+    class Meta:
+        verbose_name = "задание обработки картинки"
+        verbose_name_plural = "Задания обработки картинок"
+        ordering = ["pk"]
+
+    def __str__(self):
+        return self.image
@@ -0,0 +1,314 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Ключ «поколения» кэша счётчиков: смена значения сбрасывает все счётчики
+COUNT_GENERATION_KEY = "blog:posts-count:generation"
+
+
+class InvalidCursor(Exception):
+    """Курсор повреждён или не относится к этой выборке."""
+
+
+class CursorPage(Sequence):
+    """Страница курсорного пагинатора.
+
+    Повторяет интерфейс ``django.core.paginator.Page`` в той части,
+    которая нужна шаблонам ленты, но вместо номеров страниц отдаёт
+    непрозрачные курсоры соседних страниц.
+    """
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return "<CursorPage of %s objects>" % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(
+            self.object_list[-1], reverse=False
+        )
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return self.paginator.encode_cursor(self.object_list[0], reverse=True)
+
+
+class CursorPaginator:
+    """Пагинация по ключу (keyset) без COUNT(*) и OFFSET.
+
+    Выборка сортируется по полям ``ordering`` (все в одном направлении,
+    последнее поле должно быть уникальным), а следующая страница
+    выбирается условием «строго после последней записи», поэтому
+    стоимость запроса не зависит от глубины страницы.
+    """
+
+    def __init__(self, object_list, per_page, ordering=("-pub_date", "-pk")):
+        directions = {name.startswith("-") for name in ordering}
+        if len(directions) != 1:
+            raise ValueError(
+                "Все поля курсора должны сортироваться в одном направлении."
+            )
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.descending = directions.pop()
+        self.fields = tuple(name.lstrip("-") for name in ordering)
+
+    def _get_model_field(self, name):
+        opts = self.object_list.model._meta
+        return opts.pk if name == "pk" else opts.get_field(name)
+
+    def _position(self, obj):
+        # isoformat() сохраняет микросекунды, которые DjangoJSONEncoder
+        # отбрасывает, а без них сравнение с позицией курсора неточно.
+        return [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in (getattr(obj, name) for name in self.fields)
+        ]
+
+    def encode_cursor(self, obj, reverse):
+        payload = {"p": self._position(obj), "r": int(reverse)}
+        raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            values = payload["p"]
+            reverse = bool(payload["r"])
+        except (
+            binascii.Error, ValueError, TypeError, KeyError, UnicodeError
+        ):
+            raise InvalidCursor(cursor)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise InvalidCursor(cursor)
+        try:
+            position = [
+                self._get_model_field(name).to_python(value)
+                for name, value in zip(self.fields, values)
+            ]
+        except ValidationError:
+            raise InvalidCursor(cursor)
+        return position, reverse
+
+    def _seek_filter(self, position, forward):
+        """Условие «после позиции» (или «до» неё) в порядке сортировки."""
+        after = "lt" if self.descending == forward else "gt"
+        condition = Q()
+        for index, name in enumerate(self.fields):
+            step = Q(**{f"{name}__{after}": position[index]})
+            for prev_name, prev_value in zip(
+                self.fields[:index], position[:index]
+            ):
+                step &= Q(**{prev_name: prev_value})
+            condition |= step
+        return condition
+
+    def page(self, cursor=None):
+        """Возвращает страницу после (или до) позиции из курсора."""
+        queryset = self.object_list.order_by(*self.ordering)
+        if not cursor:
+            items = list(queryset[:self.per_page + 1])
+            return CursorPage(
+                items[:self.per_page],
+                self,
+                has_next=len(items) > self.per_page,
+                has_previous=False,
+            )
+        position, reverse = self.decode_cursor(cursor)
+        if reverse:
+            reversed_ordering = [
+                name[1:] if name.startswith("-") else "-" + name
+                for name in self.ordering
+            ]
+            items = list(
+                self.object_list.filter(self._seek_filter(position, False))
+                .order_by(*reversed_ordering)[:self.per_page + 1]
+            )
+            has_previous = len(items) > self.per_page
+            items = items[:self.per_page][::-1]
+            return CursorPage(
+                items, self, has_next=True, has_previous=has_previous
+            )
+        items = list(
+            queryset.filter(self._seek_filter(position, True))[
+                :self.per_page + 1
+            ]
+        )
+        return CursorPage(
+            items[:self.per_page],
+            self,
+            has_next=len(items) > self.per_page,
+            has_previous=True,
+        )
+
+    def get_page(self, cursor=None):
+        """Как ``page()``, но при битом курсоре отдаёт первую страницу."""
+        try:
+            return self.page(cursor)
+        except InvalidCursor:
+            return self.page()
+
+
+def estimate_count(queryset):
+    """Оценка числа строк выборки по плану запроса.
+
+    Поддерживается только PostgreSQL; для остальных СУБД возвращает None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def invalidate_post_counts():
+    """Сбрасывает закэшированные общие количества публикаций лент."""
+    cache.set(COUNT_GENERATION_KEY, uuid4().hex, None)
+
+
+class CountingPaginator(Paginator):
+    """Пагинатор с дешёвым подсчётом общего числа записей.
+
+    Считает по «облегчённой» выборке (``count_queryset`` или сама выборка
+    без ``select_related`` и сортировки), кэширует результат по ключу ленты
+    ``cache_key`` и для очень больших лент переходит на оценку по плану
+    запроса.
+    """
+
+    def __init__(
+        self, object_list, per_page, count_queryset=None, cache_key=None,
+        **kwargs
+    ):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+        self.cache_key = cache_key
+
+    def _get_cache_key(self):
+        generation = cache.get_or_set(
+            COUNT_GENERATION_KEY, uuid4().hex, None
+        )
+        return f"blog:posts-count:{generation}:{self.cache_key}"
+
+    def _count(self):
+        queryset = self.count_queryset
+        if queryset is None:
+            queryset = self.object_list
+        queryset = queryset.select_related(None).order_by()
+        threshold = settings.POSTS_COUNT_ESTIMATE_THRESHOLD
+        if (
+            threshold is not None
+            and connections[queryset.db].vendor == "postgresql"
+            and queryset[:threshold + 1].count() > threshold
+        ):
+            return estimate_count(queryset)
+        return queryset.count()
+
+    @cached_property
+    def count(self):
+        if self.cache_key is None:
+            return self._count()
+        key = self._get_cache_key()
+        total = cache.get(key)
+        if total is None:
+            total = self._count()
+            cache.set(key, total, settings.POSTS_COUNT_CACHE_TIMEOUT)
+        return total
+
+
+def estimate_table_rows(model, using):
+    """Оценка числа строк таблицы модели по статистике СУБД.
+
+    PostgreSQL — ``pg_class.reltuples``, SQLite — ``sqlite_stat1`` после
+    ``ANALYZE``. Если статистики нет, возвращает None.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [table],
+            )
+        elif connection.vendor == "sqlite":
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master"
+                " WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+            if not cursor.fetchone()[0]:
+                return None
+            cursor.execute(
+                "SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1",
+                [table],
+            )
+        else:
+            return None
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    # В sqlite_stat1 первое число строки stat — количество строк таблицы
+    rows = int(str(row[0]).split()[0]) if row[0] is not None else -1
+    return rows if rows >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор для больших списков админки.
+
+    Для выборки без фильтров и поиска вместо ``COUNT(*)`` берёт оценку
+    числа строк из статистики СУБД, если таблица больше
+    ``POSTS_COUNT_ESTIMATE_THRESHOLD``; отфильтрованные списки считаются
+    точно.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        threshold = settings.POSTS_COUNT_ESTIMATE_THRESHOLD
+        if threshold is not None and not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if estimate is not None and estimate > threshold:
+                return estimate
+        return super().count
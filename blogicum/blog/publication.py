@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Post
+
+HORIZON_KEY = "blog:publication-horizon"
+# Отметка «отложенных публикаций нет»: None в кэше означает промах
+NO_HORIZON = "none"
+
+
+def get_publication_horizon():
+    """Время ближайшей отложенной публикации или None, если их нет.
+
+    Значение хранится в кэше до следующего сохранения поста или до
+    наступления самого горизонта, но не дольше
+    ``PUBLICATION_HORIZON_TIMEOUT``: если кэш не общий для процессов,
+    сброс доходит только до процесса, сохранившего пост.
+    """
+    now = timezone.now()
+    horizon = cache.get(HORIZON_KEY)
+    if horizon is None or (horizon != NO_HORIZON and horizon <= now):
+        horizon = Post.objects.filter(
+            is_published=True, pub_date__gt=now
+        ).aggregate(horizon=Min("pub_date"))["horizon"]
+        if horizon is None:
+            horizon = NO_HORIZON
+        cache.set(HORIZON_KEY, horizon, settings.PUBLICATION_HORIZON_TIMEOUT)
+    return None if horizon == NO_HORIZON else horizon
+
+
+def reset_publication_horizon():
+    """Сбрасывает горизонт; он будет пересчитан при следующем обращении."""
+    cache.delete(HORIZON_KEY)
+
+
+def get_seconds_to_horizon(max_seconds):
+    """Сколько секунд данные лент гарантированно не устареют."""
+    horizon = get_publication_horizon()
+    if horizon is None:
+        return max_seconds
+    seconds_left = (horizon - timezone.now()).total_seconds()
+    return min(max_seconds, max(int(seconds_left), 1))
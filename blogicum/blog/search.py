@@ -0,0 +1,186 @@
+"""Полнотекстовый поиск по публикациям.
+
+Индекс — отдельная таблица, которую сигналы обновляют при сохранении и
+удалении поста:
+
+* SQLite — виртуальная таблица FTS5 ``blog_post_fts`` (rowid = id поста),
+  ранжирование по ``bm25()``;
+* PostgreSQL — таблица ``blog_post_search`` со столбцом ``tsvector`` и
+  GIN-индексом, ранжирование по ``ts_rank()``.
+
+Для остальных СУБД поиск откатывается на ``icontains`` без ранжирования.
+"""
+import re
+
+from django.conf import settings
+from django.db import connections, router
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+SQLITE_TABLE = "blog_post_fts"
+POSTGRES_TABLE = "blog_post_search"
+# Вес заголовка относительно текста при ранжировании в SQLite
+TITLE_WEIGHT = 10.0
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _connection(using=None):
+    return connections[using or router.db_for_write(Post)]
+
+
+def create_index_table(connection):
+    """Создаёт таблицу индекса для СУБД соединения (вызывается миграцией)."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE} USING "
+                "fts5(title, text, tokenize='unicode61 remove_diacritics 2')"
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {POSTGRES_TABLE} ("
+                "post_id bigint PRIMARY KEY"
+                " REFERENCES blog_post (id) ON DELETE CASCADE"
+                " DEFERRABLE INITIALLY DEFERRED,"
+                " document tsvector NOT NULL)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {POSTGRES_TABLE}_document_idx "
+                f"ON {POSTGRES_TABLE} USING gin (document)"
+            )
+
+
+def drop_index_table(connection):
+    table = {"sqlite": SQLITE_TABLE, "postgresql": POSTGRES_TABLE}.get(
+        connection.vendor
+    )
+    if table is not None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+
+def _postgres_document_sql():
+    return (
+        "setweight(to_tsvector(%s::regconfig, %s), 'A')"
+        " || setweight(to_tsvector(%s::regconfig, %s), 'B')"
+    )
+
+
+def index_posts(posts, using=None):
+    """Добавляет посты в индекс или обновляет их записи."""
+    connection = _connection(using)
+    config = settings.SEARCH_CONFIG
+    with connection.cursor() as cursor:
+        for post in posts:
+            if connection.vendor == "sqlite":
+                cursor.execute(
+                    f"INSERT OR REPLACE INTO {SQLITE_TABLE}"
+                    " (rowid, title, text)"
+                    " VALUES (%s, %s, %s)",
+                    [post.pk, post.title, post.text],
+                )
+            elif connection.vendor == "postgresql":
+                cursor.execute(
+                    f"INSERT INTO {POSTGRES_TABLE} (post_id, document)"
+                    f" VALUES (%s, {_postgres_document_sql()})"
+                    " ON CONFLICT (post_id)"
+                    " DO UPDATE SET document = EXCLUDED.document",
+                    [post.pk, config, post.title, config, post.text],
+                )
+
+
+def remove_post(post_id, using=None):
+    """Удаляет пост из индекса."""
+    connection = _connection(using)
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(
+                f"DELETE FROM {SQLITE_TABLE} WHERE rowid = %s", [post_id]
+            )
+        elif connection.vendor == "postgresql":
+            cursor.execute(
+                f"DELETE FROM {POSTGRES_TABLE} WHERE post_id = %s", [post_id]
+            )
+
+
+def rebuild_index(batch_size=1000, using=None):
+    """Перестраивает индекс по всем постам; возвращает их количество."""
+    connection = _connection(using)
+    drop_index_table(connection)
+    create_index_table(connection)
+    posts = (
+        Post.objects.using(connection.alias)
+        .order_by("pk")
+        .only("pk", "title", "text")
+    )
+    total = 0
+    batch = []
+    for post in posts.iterator(chunk_size=batch_size):
+        batch.append(post)
+        if len(batch) >= batch_size:
+            index_posts(batch, connection.alias)
+            total += len(batch)
+            batch = []
+    index_posts(batch, connection.alias)
+    return total + len(batch)
+
+
+def get_search_terms(query):
+    """Слова запроса без операторов и спецсимволов."""
+    return _WORD_RE.findall(query or "")
+
+
+def _fts5_query(terms):
+    # Каждое слово в кавычках — операторы FTS5 из запроса не срабатывают;
+    # «*» ищет слова с этим началом (падежные окончания)
+    return " ".join('"{}"*'.format(term) for term in terms)
+
+
+def search_posts(queryset, query):
+    """Отбирает из ``queryset`` посты по запросу, лучшие совпадения первыми.
+
+    Видимость постов не проверяется — фильтруйте ``queryset`` заранее.
+    """
+    terms = get_search_terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        # Индекс присоединяется к постам, и MATCH выполняется один раз;
+        # bm25() отрицательный: чем меньше, тем лучше совпадение
+        return queryset.extra(
+            select={"search_rank": f"-bm25({SQLITE_TABLE}, %s, 1.0)"},
+            select_params=(TITLE_WEIGHT,),
+            tables=[SQLITE_TABLE],
+            where=[
+                f"{SQLITE_TABLE}.rowid = {Post._meta.db_table}.id",
+                f"{SQLITE_TABLE} MATCH %s",
+            ],
+            params=[_fts5_query(terms)],
+        ).order_by("-search_rank", "-pub_date", "-pk")
+    if vendor == "postgresql":
+        config = settings.SEARCH_CONFIG
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT post_id FROM {POSTGRES_TABLE}"
+                " WHERE document @@ to_tsquery(%s::regconfig, %s)",
+                (config, tsquery),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT ts_rank(document, to_tsquery(%s::regconfig, %s))"
+                f" FROM {POSTGRES_TABLE}"
+                f" WHERE post_id = {Post._meta.db_table}.id",
+                (config, tsquery),
+            )
+        ).order_by("-search_rank", "-pub_date", "-pk")
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(text__icontains=term)
+    return queryset.filter(condition).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    ).order_by("-pub_date", "-pk")
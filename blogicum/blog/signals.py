@@ -0,0 +1,253 @@
+import threading
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+from django.db.models.functions import Greatest
+from django.db.models.signals import (
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .caching import ALL_FEEDS, invalidate_feeds
+from .image_queue import enqueue_image
+from .models import Category, Comment, Location, Post
+from .paginators import invalidate_post_counts
+from .publication import reset_publication_horizon
+from .search import index_posts, remove_post
+from .thumbnails import delete_thumbnails
+
+User = get_user_model()
+
+# Посты, которые сейчас удаляются вместе с комментариями (id по потокам)
+_deleting = threading.local()
+
+
+def _deleting_posts():
+    if not hasattr(_deleting, "posts"):
+        _deleting.posts = set()
+    return _deleting.posts
+
+
+@receiver(pre_delete, sender=Post)
+def mark_deleting_post(sender, instance, **kwargs):
+    """Отмечает удаляемый пост до каскадного удаления комментариев.
+
+    Из-за обработчиков удаления комментариев Django не может удалить их
+    одним запросом и шлёт сигнал на каждый. Счётчик и ленты поста,
+    который всё равно удаляется, обновлять незачем: без отметки это
+    стоило бы нескольких запросов на каждый комментарий.
+    """
+    _deleting_posts().add(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def unmark_deleting_post(sender, instance, **kwargs):
+    # Комментарии удаляются раньше поста, их сигналы уже отработали
+    _deleting_posts().discard(instance.pk)
+
+
+def _category_feeds(*category_ids):
+    slugs = Category.objects.filter(
+        pk__in=[pk for pk in category_ids if pk is not None]
+    ).values_list("slug", flat=True)
+    return [f"category:{slug}" for slug in slugs]
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def reset_post_counts(**kwargs):
+    """Сбрасывает кэш количества публикаций при изменении ленты."""
+    invalidate_post_counts()
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_horizon(**kwargs):
+    """Пост мог стать (или перестать быть) ближайшей отложенной записью."""
+    reset_publication_horizon()
+
+
+@receiver(pre_save, sender=Post)
+def remember_previous_post(sender, instance, **kwargs):
+    """Запоминает прежние категорию и картинку поста.
+
+    По ним сбрасывается лента старой категории и удаляются копии
+    заменённой картинки.
+    """
+    instance._previous_category_id, instance._previous_image = (
+        Post.objects.filter(pk=instance.pk)
+        .values_list("category_id", "image")
+        .first()
+        if instance.pk
+        else None
+    ) or (None, None)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def reset_post_feeds(sender, instance, **kwargs):
+    """Сбрасывает кэш главной ленты и лент категорий поста."""
+    invalidate_feeds(
+        "index",
+        *_category_feeds(
+            instance.category_id,
+            getattr(instance, "_previous_category_id", None),
+        ),
+    )
+
+
+def _image_changed(instance):
+    previous = getattr(instance, "_previous_image", None)
+    return (instance.image.name or None) != (previous or None)
+
+
+@receiver(pre_save, sender=Post)
+def reset_images_ready(sender, instance, raw=False, **kwargs):
+    """Копии новой картинки ещё не готовы — до них карточка без фото."""
+    if not raw and _image_changed(instance):
+        instance.images_ready = False
+
+
+@receiver(post_save, sender=Post)
+def update_post_thumbnails(sender, instance, raw=False, **kwargs):
+    """Ставит новую картинку поста в очередь на уменьшение."""
+    if raw or not _image_changed(instance):
+        return
+    previous = instance._previous_image
+    if previous:
+        delete_thumbnails(FieldFile(instance, instance.image.field, previous))
+    if instance.image:
+        enqueue_image(instance)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(
+    sender, instance, using, update_fields=None, **kwargs
+):
+    """Обновляет запись поста в поисковом индексе.
+
+    Сохранение из фикстуры (``raw``, ``loaddata``) тоже индексируется:
+    id, заголовок и текст в нём уже есть.
+    """
+    if update_fields is not None and not {"title", "text"} & update_fields:
+        return
+    index_posts([instance], using=using)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, using, **kwargs):
+    remove_post(instance.pk, using=using)
+
+
+@receiver(post_delete, sender=Post)
+def delete_post_thumbnails(sender, instance, **kwargs):
+    if instance.image:
+        delete_thumbnails(instance.image)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def reset_comment_feeds(sender, instance, **kwargs):
+    """Сбрасывает ленты, в карточках которых виден счётчик комментариев."""
+    if instance.post_id in _deleting_posts():
+        return  # Ленты сбросит удаление самого поста
+    category_id = (
+        Post.objects.filter(pk=instance.post_id)
+        .values_list("category_id", flat=True)
+        .first()
+    )
+    invalidate_feeds("index", *_category_feeds(category_id))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def reset_all_feeds(**kwargs):
+    """Категории и места видны во всех лентах — сбрасываем все сразу."""
+    invalidate_feeds(ALL_FEEDS)
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_posts(sender, instance, raw=False, **kwargs):
+    """Обновляет версию карточек постов категории (см. post_card.html)."""
+    if raw:  # Загрузка фикстуры: данные постов приходят как есть
+        return
+    Post.objects.filter(category=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Location)
+@receiver(pre_delete, sender=Location)
+def touch_location_posts(sender, instance, raw=False, **kwargs):
+    """Обновляет версию карточек постов с этим местом."""
+    if raw:
+        return
+    Post.objects.filter(location=instance).update(updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_username(
+    sender, instance, update_fields=None, **kwargs
+):
+    """Запоминает прежнее имя пользователя, если оно может измениться."""
+    instance._previous_username = (
+        User.objects.filter(pk=instance.pk)
+        .values_list("username", flat=True)
+        .first()
+        if instance.pk
+        and (update_fields is None or "username" in update_fields)
+        else None
+    )
+
+
+@receiver(post_save, sender=User)
+def reset_feeds_on_username_change(sender, instance, raw=False, **kwargs):
+    """Имя автора есть в карточках постов.
+
+    Регистрация, смена пароля, правка профиля и вход имя не меняют —
+    ленты и карточки тогда не сбрасываются.
+    """
+    previous = getattr(instance, "_previous_username", None)
+    if previous is None or previous == instance.username:
+        return
+    invalidate_feeds(ALL_FEEDS)
+    if raw:
+        return
+    Post.objects.filter(author=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(
+    sender, instance, created, raw=False, **kwargs
+):
+    """Увеличивает счётчик комментариев поста при добавлении комментария.
+
+    Заодно обновляет ``updated_at`` поста: по нему считается ETag
+    страницы поста, а правка комментария меняет её разметку.
+    При загрузке фикстуры (``raw``) счётчик уже есть в данных поста.
+    """
+    if raw:
+        return
+    changes = {"updated_at": timezone.now()}
+    if created:
+        changes["comment_count"] = F("comment_count") + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """Уменьшает счётчик комментариев поста при удалении комментария."""
+    if instance.post_id in _deleting_posts():
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F("comment_count") - 1, 0),
+        updated_at=timezone.now(),
+    )
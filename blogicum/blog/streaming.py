@@ -0,0 +1,68 @@
+"""Потоковое чтение JSON без загрузки всего файла в память."""
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\r\n"
+
+
+class _ChunkedBuffer:
+    """Недоразобранный хвост потока, дочитываемый кусками."""
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.position = 0
+
+    def read_more(self):
+        chunk = self.stream.read(self.chunk_size)
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+        return bool(chunk)
+
+    def next_char(self, skip=_WHITESPACE):
+        """Первый символ не из ``skip`` или None в конце потока."""
+        while True:
+            while (
+                self.position < len(self.text)
+                and self.text[self.position] in skip
+            ):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                return None
+
+    def decode(self):
+        """Разбирает очередное JSON-значение, дочитывая поток при нужде."""
+        while True:
+            try:
+                item, end = _decoder.raw_decode(self.text, self.position)
+            except json.JSONDecodeError:
+                if not self.read_more():
+                    raise
+                continue
+            # Число на границе куска могло быть прочитано не целиком
+            if end == len(self.text) and self.read_more():
+                continue
+            self.position = end
+            return item
+
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """Перебирает элементы JSON-массива верхнего уровня по одному.
+
+    Файл читается кусками по ``chunk_size`` символов; в памяти держится
+    только текущий недоразобранный хвост, а не весь документ.
+    """
+    buffer = _ChunkedBuffer(stream, chunk_size)
+    if buffer.next_char() != "[":
+        raise ValueError("Ожидался JSON-массив.")
+    buffer.position += 1
+    while True:
+        char = buffer.next_char(skip=_WHITESPACE + ",")
+        if char is None:
+            raise ValueError("Неожиданный конец JSON-массива.")
+        if char == "]":
+            return
+        yield buffer.decode()
@@ -0,0 +1,199 @@
+"""Синтетические данные в масштабе боевой базы.
+
+``DataGenerator`` создаёт пользователей, категории, места, посты и
+комментарии пачками через ``bulk_create``. Данные определяются зерном
+``seed``: одинаковые параметры дают одинаковые тексты, авторов и
+распределение комментариев. В памяти держится одна пачка объектов и
+массивы id пользователей и постов (8 байт на запись), поэтому десятки
+миллионов комментариев генерируются в ограниченной памяти.
+
+Комментарии распределены по закону Ципфа: пост с номером ``i`` получает
+их пропорционально ``1 / i ** skew`` — немного постов собирают большую
+часть обсуждений, как на живом сайте.
+"""
+import random
+from array import array
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Category, Comment, Location, Post
+
+User = get_user_model()
+
+DAY = 24 * 60 * 60
+
+# Словарь для заголовков и текстов
+WORDS = (
+    "город", "река", "утро", "вечер", "дорога", "лес", "поле", "море",
+    "солнце", "дождь", "ветер", "дом", "окно", "книга", "письмо", "друг",
+    "время", "работа", "поезд", "небо", "снег", "весна", "осень", "зима",
+    "лето", "гора", "мост", "парк", "кофе", "музей", "жираф", "кошка",
+)
+
+
+class DataGenerator:
+    """Наполняет базу ``using`` синтетическими данными.
+
+    Имена пользователей и slug категорий содержат зерно, поэтому
+    повторный запуск с тем же ``seed`` в ту же базу упадёт на
+    уникальности — берите другое зерно.
+    """
+
+    def __init__(
+        self, seed=0, batch_size=5000, using=DEFAULT_DB_ALIAS, report=None
+    ):
+        self.rng = random.Random(seed)
+        self.prefix = f"s{seed}-"
+        self.batch_size = batch_size
+        self.using = using
+        self.report = report or (lambda label, count: None)
+        self.now = timezone.now()
+        self.user_ids = array("q")
+        self.category_ids = array("q")
+        self.location_ids = array("q")
+        self.post_ids = array("q")
+
+    def _text(self, words):
+        return " ".join(self.rng.choices(WORDS, k=words))
+
+    def _bulk_create(self, model, objects):
+        """Вставляет объекты из итератора пачками по ``batch_size``."""
+        manager = model._base_manager.using(self.using)
+        objects = iter(objects)
+        total = 0
+        while True:
+            batch = list(islice(objects, self.batch_size))
+            if not batch:
+                return total
+            with transaction.atomic(using=self.using):
+                manager.bulk_create(batch)
+            # При DEBUG соединение копит текст запросов — с ним память
+            # росла бы с каждой пачкой
+            connections[self.using].queries_log.clear()
+            total += len(batch)
+            self.report(model._meta.label, total)
+
+    def _insert(self, model, objects):
+        """Вставляет объекты и возвращает id новых строк по порядку.
+
+        ``bulk_create`` в SQLite не возвращает id, поэтому они
+        перечитываются — все строки после максимального id до вставки.
+        """
+        manager = model._base_manager.using(self.using)
+        last_pk = manager.aggregate(last=Max("pk"))["last"] or 0
+        self._bulk_create(model, objects)
+        return array(
+            "q",
+            manager.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=self.batch_size),
+        )
+
+    def users(self, count):
+        self.user_ids = self._insert(
+            User,
+            (
+                User(
+                    username=f"{self.prefix}user{number}",
+                    password=UNUSABLE_PASSWORD_PREFIX,
+                )
+                for number in range(count)
+            ),
+        )
+
+    def categories(self, count, hidden=0.1):
+        """Категории; доля ``hidden`` снята с публикации."""
+        self.category_ids = self._insert(
+            Category,
+            (
+                Category(
+                    title=f"Категория {number}",
+                    description=self._text(12),
+                    slug=f"{self.prefix}category-{number}",
+                    is_published=self.rng.random() >= hidden,
+                )
+                for number in range(count)
+            ),
+        )
+
+    def locations(self, count):
+        self.location_ids = self._insert(
+            Location,
+            (Location(name=f"Место {number}") for number in range(count)),
+        )
+
+    def _post(self, number, unpublished, future, days):
+        rng = self.rng
+        if rng.random() < future:  # Отложенная публикация
+            pub_date = self.now + timedelta(seconds=rng.randrange(DAY * 30))
+        else:
+            pub_date = self.now - timedelta(seconds=rng.randrange(DAY * days))
+        return Post(
+            title=f"{self._text(3).capitalize()} {number}",
+            text=self._text(rng.randint(20, 200)),
+            pub_date=pub_date,
+            author_id=rng.choice(self.user_ids),
+            category_id=rng.choice(self.category_ids),
+            # Примерно у каждого пятого поста место не указано
+            location_id=(
+                rng.choice(self.location_ids)
+                if self.location_ids and rng.random() >= 0.2
+                else None
+            ),
+            is_published=rng.random() >= unpublished,
+        )
+
+    def posts(self, count, unpublished=0.05, future=0.02, days=365):
+        """Посты за последние ``days`` дней.
+
+        Доля ``unpublished`` снята с публикации, доля ``future`` — с
+        датой публикации в ближайшем месяце.
+        """
+        self.post_ids = self._insert(
+            Post,
+            (
+                self._post(number, unpublished, future, days)
+                for number in range(count)
+            ),
+        )
+
+    def comments(self, count, skew=1.0):
+        """Комментарии по постам с распределением Ципфа (см. модуль)."""
+        if not self.post_ids:
+            return
+        cum_weights = array(
+            "d",
+            accumulate(
+                1 / rank ** skew
+                for rank in range(1, len(self.post_ids) + 1)
+            ),
+        )
+        # Какой пост «популярный», решает зерно, а не порядок вставки
+        post_ids = array("q", self.post_ids)
+        self.rng.shuffle(post_ids)
+        indexes = range(len(post_ids))
+
+        def generate():
+            left = count
+            while left > 0:
+                size = min(left, self.batch_size)
+                chosen = self.rng.choices(
+                    indexes, cum_weights=cum_weights, k=size
+                )
+                for index in chosen:
+                    yield Comment(
+                        post_id=post_ids[index],
+                        author_id=self.rng.choice(self.user_ids),
+                        text=self._text(self.rng.randint(3, 40)),
+                    )
+                left -= size
+
+        # id комментариев не нужны — их массив в памяти не держим
+        self._bulk_create(Comment, generate())
@@ -0,0 +1,18 @@
+from django import template
+
+from blog.thumbnails import get_thumbnail_sources
+
+register = template.Library()
+
+
+@register.inclusion_tag("includes/post_image.html")
+def post_image(post, size):
+    """Картинка поста в размере ``size`` из ``THUMBNAIL_SIZES``.
+
+    Отдаёт ``<picture>`` с уменьшенными копиями; оригинал в разметку
+    не попадает. Пока копии готовятся, выводится заглушка.
+    """
+    if not post.images_ready:
+        return {"post": post, "placeholder": True}
+    *sources, fallback = get_thumbnail_sources(post.image, size)
+    return {"sources": sources, "fallback": fallback, "post": post}
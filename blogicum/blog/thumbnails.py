@@ -0,0 +1,93 @@
+"""Уменьшенные копии картинок постов.
+
+Копии лежат рядом с оригиналом: для ``posts/photo.png`` размера ``card``
+это ``posts/photo.card.webp`` и ``posts/photo.card.jpg``.
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+CONTENT_TYPES = {"webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+def thumbnail_name(name, size, image_format):
+    """Имя файла копии картинки ``name`` в размере ``size``."""
+    if size not in settings.THUMBNAIL_SIZES:
+        raise ValueError(f"Неизвестный размер картинки: {size}.")
+    root = posixpath.splitext(name)[0]
+    return f"{root}.{size}.{EXTENSIONS[image_format]}"
+
+
+def iter_thumbnail_names(name):
+    for size in settings.THUMBNAIL_SIZES:
+        for image_format in settings.THUMBNAIL_FORMATS:
+            yield thumbnail_name(name, size, image_format)
+
+
+def _encode(image, image_format):
+    if image_format == "jpeg" or image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    # Метаданные (в том числе EXIF с координатами) в копию не попадают
+    image.save(
+        buffer,
+        format=image_format.upper(),
+        quality=settings.THUMBNAIL_QUALITY,
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def generate_thumbnails(field_file):
+    """Создаёт все копии картинки поста, заменяя прежние.
+
+    Возвращает имена созданных файлов.
+    """
+    storage = field_file.storage
+    with field_file.open("rb"):
+        original = Image.open(field_file)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+    names = []
+    for size, box in settings.THUMBNAIL_SIZES.items():
+        image = original.copy()
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        for image_format in settings.THUMBNAIL_FORMATS:
+            name = thumbnail_name(field_file.name, size, image_format)
+            storage.delete(name)
+            names.append(storage.save(name, _encode(image, image_format)))
+    return names
+
+
+def delete_thumbnails(field_file):
+    """Удаляет копии картинки; сам оригинал остаётся на месте."""
+    for name in iter_thumbnail_names(field_file.name):
+        field_file.storage.delete(name)
+
+
+def safe_generate_thumbnails(field_file):
+    """Как ``generate_thumbnails()``, но ошибка не ломает сохранение поста."""
+    try:
+        return generate_thumbnails(field_file)
+    except (OSError, Image.DecompressionBombError):
+        logger.exception("Не удалось уменьшить картинку %s", field_file.name)
+        return []
+
+
+def get_thumbnail_sources(field_file, size):
+    """URL копий картинки в размере ``size`` по форматам, основной первым."""
+    return [
+        {
+            "url": field_file.storage.url(
+                thumbnail_name(field_file.name, size, image_format)
+            ),
+            "type": CONTENT_TYPES[image_format],
+        }
+        for image_format in settings.THUMBNAIL_FORMATS
+    ]
@@ -1,17 +1,27 @@
 # blogicum/blog/urls.py
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = "blog"
 
+# Страницы чтения в синхронном или асинхронном (для ASGI) варианте
+read_views = async_views if settings.BLOG_ASYNC_VIEWS else views
+
 urlpatterns = [
-    path("", views.index, name="index"),
-    path("posts/<int:post_id>/", views.post_detail, name="post_detail"),
+    path("", read_views.index, name="index"),
+    path("posts/<int:post_id>/", read_views.post_detail, name="post_detail"),
+    path(
+        "posts/<int:post_id>/comments/",
+        views.post_comments,
+        name="post_comments",
+    ),
     path(
         "category/<slug:slug>/",
-        views.category_posts,
+        read_views.category_posts,
         name="category_posts",
     ),
+    path("search/", views.search, name="search"),
     path("posts/create/", views.PostCreateView.as_view(), name="post_create"),
     path(
         "posts/<int:post_id>/edit/",
@@ -43,9 +53,10 @@ urlpatterns += [
     ),
     path(
         "profile/<str:username>/",
-        views.profile_detail,
+        read_views.profile_detail,
         name="profile_detail",
     ),
+    path("export/<slug:kind>/", views.export, name="export"),
     path(
         "profile/<str:username>/edit/",
         views.edit_profile,
@@ -1,23 +1,41 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404, render
 from django.utils import timezone  # Работа с датой и временем
-from django.http import Http404  # Генерация ошибки 404
+from django.http import (  # Генерация ошибки 404 и ответы без шаблона
+    Http404,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from .models import Post, Category, Comment  # Импорт моделей
 from django.urls import reverse_lazy
 from django.views.generic import CreateView, UpdateView, DeleteView  # Для CBV
 from django.contrib.auth import get_user_model
 from .forms import PostForm, CommentForm, ProfileEditForm  # Импортируем формы
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     UserPassesTestMixin,
 )  # Для CBV и проверки прав
 from django.shortcuts import redirect  # Для ручных редиреков
-from django.db.models import Count, Q
-from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils.http import urlencode
+from .caching import add_feed_expiry, cache_feed_page
+from .conditional import (
+    conditional_page,
+    get_category_state,
+    get_index_state,
+    get_post_state,
+)
+from .exports import CONTENT_TYPES, EXPORTS, iter_export
+from .paginators import CountingPaginator, CursorPaginator
+from .search import search_posts
 
 
 User = get_user_model()
 
+POSTS_PER_PAGE = 10
+
 
 def get_published_posts(queryset):
     """Фильтрует посты по статусу публикации и дате."""
@@ -29,19 +47,49 @@ def get_published_posts(queryset):
 
 
 def get_posts_with_comments(queryset):
-    """Аннотирует queryset постов количеством комментариев и сортирует."""
-    return queryset.annotate(
-        comment_count=Count("comments")
-    ).order_by("-pub_date")
+    """Сортирует queryset постов для ленты.
+
+    Количество комментариев хранится в поле ``Post.comment_count``,
+    поэтому агрегировать комментарии здесь не нужно.
+    """
+    return queryset.order_by("-pub_date")
+
 
+def get_post_comments(post, cursor=None):
+    """Возвращает страницу комментариев поста вместе с авторами.
 
-def get_page_obj(request, post_list, posts_per_page=10):
-    """Возвращает объект страницы пагинатора."""
-    paginator = Paginator(post_list, posts_per_page)
+    Комментарии листаются курсором по (created_at, id), чтобы пост
+    с тысячами комментариев не отдавался одной огромной страницей.
+    """
+    paginator = CursorPaginator(
+        post.comments.select_related("author"),
+        settings.COMMENTS_PER_PAGE,
+        ordering=("created_at", "pk"),
+    )
+    return paginator.get_page(cursor)
+
+
+def get_page_obj(
+    request, post_list, posts_per_page=POSTS_PER_PAGE, feed_key=None
+):
+    """Возвращает объект страницы пагинатора.
+
+    Курсорный режим включается настройкой ``POSTS_PAGINATION = "cursor"``
+    или параметром ``?cursor=`` в запросе. В нумерованном режиме общее
+    количество публикаций кэшируется по ключу ленты ``feed_key``.
+    """
+    if settings.POSTS_PAGINATION == "cursor" or "cursor" in request.GET:
+        paginator = CursorPaginator(post_list, posts_per_page)
+        return paginator.get_page(request.GET.get("cursor"))
+    paginator = CountingPaginator(
+        post_list, posts_per_page, cache_key=feed_key
+    )
     page_number = request.GET.get("page")
     return paginator.get_page(page_number)
 
 
+@cache_feed_page("index")
+@conditional_page(get_index_state)
 def index(request):
     post_list = get_posts_with_comments(
         get_published_posts(
@@ -50,31 +98,58 @@ def index(request):
             )
         )
     )
-    page_obj = get_page_obj(request, post_list)
+    page_obj = get_page_obj(request, post_list, feed_key="index")
     context = {
         "page_obj": page_obj,
     }
-    return render(request, "blog/index.html", context)
+    return add_feed_expiry(
+        request, render(request, "blog/index.html", context)
+    )
 
 
+@cache_feed_page("category:{slug}")
+@conditional_page(get_category_state)
 def category_posts(request, slug):
     category = get_object_or_404(Category, slug=slug, is_published=True)
     post_list = get_posts_with_comments(
         get_published_posts(
-            Post.objects.select_related("author", "location").filter(
-                category=category
-            )
+            Post.objects.select_related(
+                "category", "author", "location"
+            ).filter(category=category)
         )
     )
-    page_obj = get_page_obj(request, post_list)
+    page_obj = get_page_obj(
+        request, post_list, feed_key=f"category:{category.pk}"
+    )
     context = {
         "category": category,
         "page_obj": page_obj,
     }
-    return render(request, "blog/category.html", context)
+    return add_feed_expiry(
+        request, render(request, "blog/category.html", context)
+    )
+
+
+def search(request):
+    """Поиск по опубликованным постам, лучшие совпадения первыми."""
+    query = request.GET.get("q", "").strip()
+    post_list = search_posts(
+        get_published_posts(
+            Post.objects.select_related("category", "author", "location")
+        ),
+        query,
+    )
+    paginator = CountingPaginator(post_list, POSTS_PER_PAGE)
+    context = {
+        "query": query,
+        "page_obj": paginator.get_page(request.GET.get("page")),
+        "pagination_query": urlencode({"q": query}) + "&",
+    }
+    return render(request, "blog/search.html", context)
 
 
-def post_detail(request, post_id):
+def get_visible_post(request, post_id):
+    """Возвращает пост, если текущий пользователь может его видеть."""
     post = get_object_or_404(
         Post.objects.select_related(
             "category", "author", "location"
@@ -88,37 +163,85 @@ def post_detail(request, post_id):
             or (post.category is None or not post.category.is_published)
         ):
             raise Http404("Публикация не найдена или не опубликована.")
+    return post
+
 
+@conditional_page(get_post_state)
+def post_detail(request, post_id):
+    post = get_visible_post(request, post_id)
     comment_form = CommentForm()
     context = {
         "post": post,
         "comment_form": comment_form,
+        "comments": get_post_comments(post),
     }
     return render(request, "blog/detail.html", context)
 
 
+def post_comments(request, post_id):
+    """Следующая страница комментариев поста: HTML-фрагмент или JSON."""
+    post = get_visible_post(request, post_id)
+    comments = get_post_comments(post, request.GET.get("cursor"))
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "comments": [
+                    {
+                        "id": comment.pk,
+                        "author": comment.author.username,
+                        "text": comment.text,
+                        "created_at": comment.created_at,
+                    }
+                    for comment in comments
+                ],
+                "next_cursor": comments.next_cursor,
+            }
+        )
+    context = {
+        "post": post,
+        "comments": comments,
+    }
+    return render(request, "includes/comment_list.html", context)
+
+
+@staff_member_required
+def export(request, kind):
+    """Потоковая выгрузка публикаций или комментариев для персонала."""
+    export_format = request.GET.get("format", "ndjson")
+    if kind not in EXPORTS or export_format not in CONTENT_TYPES:
+        raise Http404
+    response = StreamingHttpResponse(
+        iter_export(kind, export_format),
+        content_type=CONTENT_TYPES[export_format],
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="{kind}.{export_format}"'
+    )
+    return response
+
+
 def profile_detail(request, username):
     profile = get_object_or_404(User, username=username)
 
     if request.user == profile:
-        post_list = get_posts_with_comments(
-            profile.posts.select_related(
-                "category", "location"
-            )
-        )
+        posts = profile.posts.select_related("category", "location")
+        feed_key = f"author:{profile.pk}:all"
     else:
-        post_list = get_posts_with_comments(
-            get_published_posts(
-                profile.posts.select_related("category", "location")
-            )
+        posts = get_published_posts(
+            profile.posts.select_related("category", "location")
         )
+        feed_key = f"author:{profile.pk}:published"
 
-    page_obj = get_page_obj(request, post_list)
+    page_obj = get_page_obj(
+        request, get_posts_with_comments(posts), feed_key=feed_key
+    )
     context = {
         "profile": profile,
         "page_obj": page_obj,
     }
-    return render(request, "blog/profile.html", context)
+    return add_feed_expiry(
+        request, render(request, "blog/profile.html", context)
+    )
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -137,23 +260,56 @@ class PostCreateView(LoginRequiredMixin, CreateView):
         )
 
 
-class PostUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
-    model = Post
-    form_class = PostForm
-    template_name = "blog/create.html"
-    pk_url_kwarg = "post_id"
+class OwnerRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
+    """Пускает к объекту только его автора.
+
+    Объект (вместе с автором) загружается один раз за запрос: проверка
+    прав, отказ в доступе, сама обработка и адрес перехода используют
+    один и тот же экземпляр.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("author")
+
+    def get_object(self, queryset=None):
+        if not hasattr(self, "_owned_object"):
+            self._owned_object = super().get_object(queryset)
+        return self._owned_object
 
     def test_func(self):
-        post = self.get_object()
-        return self.request.user == post.author
+        return self.request.user == self.get_object().author
 
     def handle_no_permission(self):
-        post = self.get_object()
-        return redirect("blog:post_detail", post_id=post.pk)
+        self.get_object()  # 404 для несуществующего объекта
+        return redirect("blog:post_detail", post_id=self.kwargs["post_id"])
+
+
+class CommentOwnerMixin(OwnerRequiredMixin):
+    """Комментарий ищется в рамках поста из URL."""
+
+    model = Comment
+    pk_url_kwarg = "comment_id"
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("post").filter(
+            post__pk=self.kwargs.get("post_id")
+        )
+
+    def get_success_url(self):
+        return reverse_lazy(
+            "blog:post_detail", kwargs={"post_id": self.kwargs.get("post_id")}
+        )
+
+
+class PostUpdateView(OwnerRequiredMixin, UpdateView):
+    model = Post
+    form_class = PostForm
+    template_name = "blog/create.html"
+    pk_url_kwarg = "post_id"
 
     def get_success_url(self):
         return reverse_lazy(
-            "blog:post_detail", kwargs={"post_id": self.get_object().pk}
+            "blog:post_detail", kwargs={"post_id": self.object.pk}
         )
 
 
@@ -169,24 +325,17 @@ def add_comment(request, post_id):
         return redirect("blog:post_detail", post_id=post_id)
     context = {
         "post": post,
-        "form": form,
+        "comment_form": form,
+        "comments": get_post_comments(post),
     }
     return render(request, "blog/detail.html", context)
 
 
-class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class PostDeleteView(OwnerRequiredMixin, DeleteView):
     model = Post
     template_name = "blog/post_confirm_delete.html"
     pk_url_kwarg = "post_id"
 
-    def test_func(self):
-        post = self.get_object()
-        return self.request.user == post.author
-
-    def handle_no_permission(self):
-        post = self.get_object()
-        return redirect("blog:post_detail", post_id=post.pk)
-
     def get_success_url(self):
         return reverse_lazy(
             "blog:profile_detail",
@@ -194,28 +343,8 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         )
 
 
-class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
-    model = Comment
+class CommentDeleteView(CommentOwnerMixin, DeleteView):
     template_name = "blog/comment_confirm_delete.html"
-    pk_url_kwarg = "comment_id"
-
-    def get_object(self, _queryset=None):
-        post_id = self.kwargs.get("post_id")
-        comment_id = self.kwargs.get("comment_id")
-        return get_object_or_404(Comment, pk=comment_id, post__pk=post_id)
-
-    def test_func(self):
-        comment = self.get_object()
-        return self.request.user == comment.author
-
-    def handle_no_permission(self):
-        comment = self.get_object()
-        return redirect("blog:post_detail", post_id=comment.post.pk)
-
-    def get_success_url(self):
-        return reverse_lazy(
-            "blog:post_detail", kwargs={"post_id": self.kwargs.get("post_id")}
-        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -224,30 +353,9 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         return context
 
 
-class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
-    model = Comment
+class CommentUpdateView(CommentOwnerMixin, UpdateView):
     form_class = CommentForm
     template_name = "blog/comment_edit.html"
-    pk_url_kwarg = "comment_id"
-
-    def get_object(self, _queryset=None):
-        post_id = self.kwargs.get("post_id")
-        comment_id = self.kwargs.get("comment_id")
-        return get_object_or_404(Comment, pk=comment_id, post__pk=post_id)
-
-    def test_func(self):
-        comment = self.get_object()
-        return self.request.user == comment.author
-
-    def handle_no_permission(self):
-        comment = self.get_object()
-        return redirect("blog:post_detail", post_id=comment.post.pk)
-
-    def get_success_url(self):
-        comment = self.get_object()
-        return reverse_lazy(
-            "blog:post_detail", kwargs={"post_id": comment.post.pk}
-        )
 
 
 @login_required
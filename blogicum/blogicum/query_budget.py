@@ -0,0 +1,95 @@
+"""Учёт SQL-запросов каждого запроса к сайту.
+
+``QueryBudgetMiddleware`` считает запросы к БД и их суммарное время через
+``connection.execute_wrapper``, отдаёт их заголовком ``Server-Timing``
+(виден во вкладке Network браузера) и пишет в лог
+``blogicum.query_budget`` предупреждение, если представление превысило
+бюджет из ``QUERY_BUDGETS``.
+
+Учитываются запросы потока, обрабатывающего запрос; запросы при отдаче
+потокового ответа (после возврата из представления) не учитываются.
+"""
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Запросы к БД за время обработки одного запроса к сайту."""
+
+    def __init__(self, record_sql=False):
+        self.count = 0
+        self.duration = 0.0
+        self.record_sql = record_sql
+        self.queries = []
+        self.budget = None
+        self.view_name = None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - start
+            if self.record_sql:
+                self.queries.append(sql)
+
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.count > self.budget
+
+
+def get_query_budget(view_name):
+    """Бюджет запросов представления или None, если он не задан."""
+    return settings.QUERY_BUDGETS.get(
+        view_name, settings.QUERY_BUDGET_DEFAULT
+    )
+
+
+class QueryBudgetMiddleware:
+    """Считает запросы к БД и сверяет их с бюджетом представления.
+
+    Статистика доступна как ``request.query_stats`` и
+    ``response.query_stats``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = QueryStats(record_sql=settings.QUERY_BUDGET_RECORD_SQL)
+        request.query_stats = stats
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+
+        match = request.resolver_match
+        if match is not None:
+            stats.view_name = match.view_name
+            stats.budget = get_query_budget(match.view_name)
+        if stats.over_budget:
+            logger.warning(
+                "%s %s (%s): %d SQL-запросов при бюджете %d, %.1f мс",
+                request.method,
+                request.path,
+                stats.view_name,
+                stats.count,
+                stats.budget,
+                stats.duration * 1000,
+                extra={"request": request, "query_stats": stats},
+            )
+        timing = 'db;dur={:.1f};desc="{} queries"'.format(
+            stats.duration * 1000, stats.count
+        )
+        if response.has_header("Server-Timing"):
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        response.query_stats = stats
+        return response
@@ -0,0 +1,88 @@
+"""Чтение с реплик базы данных.
+
+``ReplicaMiddleware`` отмечает запросы к страницам только для чтения
+(``REPLICA_VIEWS``) контекстной переменной, и ``ReplicaRouter`` отправляет
+их чтения на случайную реплику из ``DATABASE_REPLICAS``. Все записи и
+всё остальное — команды, фоновые потоки, формы — идут в ``default``.
+
+Реплика отстаёт от основной базы, поэтому после записи (любого
+запроса не GET/HEAD) посетитель получает cookie и ``REPLICA_PIN_SECONDS``
+секунд читает с основной базы: после добавления комментария редирект
+показывает пост уже с ним, а сессия только что вошедшего пользователя
+находится.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import Resolver404, resolve
+
+PIN_COOKIE = "db_primary"
+
+_use_replica = ContextVar("use_replica", default=False)
+
+
+def is_reading_replica():
+    """Читает ли текущий запрос с реплики."""
+    return bool(settings.DATABASE_REPLICAS and _use_replica.get())
+
+
+class ReplicaRouter:
+    """Чтения отмеченных запросов — на реплику, остальное — в default."""
+
+    def db_for_read(self, model, **hints):
+        if is_reading_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Явно: иначе объект, прочитанный с реплики, сохранялся бы в неё
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплики — копии default, связи между их объектами допустимы
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+
+class ReplicaMiddleware:
+    """Читает с реплики страницы из ``REPLICA_VIEWS``, если нет записи."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _use_replica(self, request):
+        if (
+            not settings.DATABASE_REPLICAS
+            or request.method not in ("GET", "HEAD")
+            or PIN_COOKIE in request.COOKIES
+        ):
+            return False
+        try:
+            match = resolve(
+                request.path_info, getattr(request, "urlconf", None)
+            )
+        except Resolver404:
+            return False
+        return match.view_name in settings.REPLICA_VIEWS
+
+    def __call__(self, request):
+        token = _use_replica.set(self._use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        if settings.DATABASE_REPLICAS and request.method not in (
+            "GET", "HEAD", "OPTIONS",
+        ):
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "blogicum.query_budget.QueryBudgetMiddleware",
+    "blogicum.replicas.ReplicaMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -76,6 +78,9 @@ TEMPLATES = [
 
 TEMPLATES_DIR = BASE_DIR / "templates"
 
+# Загружать все шаблоны при старте процесса (см. settings_production.py)
+TEMPLATE_WARMUP = False
+
 WSGI_APPLICATION = "blogicum.wsgi.application"
 
 
@@ -88,6 +93,33 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+# Реплики только для чтения — алиасы из DATABASES (blogicum/replicas.py).
+# Для проверки локально: DJANGO_REPLICA_SQLITE=путь к копии db.sqlite3
+DATABASE_REPLICAS = []
+if os.environ.get("DJANGO_REPLICA_SQLITE"):
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ["DJANGO_REPLICA_SQLITE"],
+    }
+    DATABASE_REPLICAS = ["replica"]
+DATABASE_ROUTERS = ["blogicum.replicas.ReplicaRouter"]
+# PRAGMA для каждого нового соединения SQLite (blogicum/sqlite.py);
+# пусто — настройки SQLite по умолчанию, профиль — в settings_production
+SQLITE_PRAGMAS = {}
+# Страницы, которые читают с реплик
+REPLICA_VIEWS = [
+    "blog:index",
+    "blog:category_posts",
+    "blog:post_detail",
+    "blog:profile_detail",
+    "pages:about",
+    "pages:rules",
+    "pages:author",
+    "pages:tech",
+]
+# Сколько секунд после записи посетитель читает с основной базы:
+# должно перекрывать отставание реплик
+REPLICA_PIN_SECONDS = 10
 
 # Email Backend (для отладки)
 EMAIL_BACKEND = "django.core.mail.backends.filebased.EmailBackend"
@@ -139,6 +171,67 @@ STATIC_URL = "/static/"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Асинхронные варианты лент и страницы поста (blog/async_views.py)
+# для запуска под ASGI-сервером
+BLOG_ASYNC_VIEWS = os.environ.get("BLOG_ASYNC_VIEWS") == "1"
+
+# Пагинация лент публикаций: "page" — нумерованные страницы,
+# "cursor" — по курсору (pub_date, id) без COUNT(*) и OFFSET
+POSTS_PAGINATION = "page"
+# Сколько секунд хранить в кэше общее количество публикаций ленты
+POSTS_COUNT_CACHE_TIMEOUT = 60
+# Начиная с какого количества публикаций считать их приблизительно
+# (по плану запроса PostgreSQL); None — всегда точный подсчёт
+POSTS_COUNT_ESTIMATE_THRESHOLD = 100_000
+
+# Сколько секунд хранить в кэше страницы лент для анонимных посетителей
+FEED_CACHE_TIMEOUT = 300
+# Сколько секунд хранить в кэше время ближайшей отложенной публикации:
+# процесс, не получивший сброс, ошибётся не дольше этого срока
+PUBLICATION_HORIZON_TIMEOUT = 60
+# Сколько комментариев показывать на странице поста за один раз
+COMMENTS_PER_PAGE = 50
+# Сколько строк читать из базы за раз при потоковой выгрузке
+EXPORT_CHUNK_SIZE = 2000
+# Уменьшенные копии картинок постов: размер -> вписывающая рамка в пикселях
+THUMBNAIL_SIZES = {
+    "card": (640, 480),
+    "detail": (1280, 960),
+}
+# Форматы уменьшенных копий: первый — основной, последний — запасной для <img>
+THUMBNAIL_FORMATS = ("webp", "jpeg")
+THUMBNAIL_QUALITY = 80
+# Конфигурация полнотекстового поиска PostgreSQL (словарь и стемминг)
+SEARCH_CONFIG = "russian"
+# Очередь фоновой обработки картинок: класс очереди и число потоков в
+# процессе сайта (0 — задания разбирает manage.py process_image_jobs;
+# для MemoryQueue так задания потеряются)
+IMAGE_QUEUE = {
+    "BACKEND": "blog.image_queue.MemoryQueue",
+    "WORKERS": 2,
+}
+# Сколько SQL-запросов допустимо представлению за один запрос к сайту
+# (blogicum/query_budget.py): превышение пишется в лог и валит тесты
+QUERY_BUDGETS = {
+    "blog:index": 5,
+    "blog:category_posts": 6,
+    "blog:post_detail": 5,
+    "blog:post_comments": 4,
+    "blog:profile_detail": 5,
+    "blog:search": 4,
+    "blog:post_create": 9,
+    "blog:post_edit": 11,
+    "blog:post_delete": 10,
+    "blog:add_comment": 7,
+    "blog:edit_comment": 7,
+    "blog:delete_comment": 8,
+    "blog:edit_profile": 6,
+}
+# Бюджет представлений, которых нет в QUERY_BUDGETS; None — без проверки
+QUERY_BUDGET_DEFAULT = None
+# Запоминать ли текст запросов (для сообщений тестов; в бою не нужно)
+QUERY_BUDGET_RECORD_SQL = False
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/3.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,96 @@
+"""Настройки боевого окружения.
+
+Запуск: ``DJANGO_SETTINGS_MODULE=blogicum.settings_production``.
+Отличия от разработки: выключен DEBUG, шаблоны загружаются кэширующим
+загрузчиком и прогреваются при старте процесса, статика собирается
+с хэшами в именах и сжатыми копиями и отдаётся самим Django, кэш
+общий для всех процессов сайта, SQLite работает в режиме WAL.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401, F403
+from .settings import BASE_DIR, MIDDLEWARE, TEMPLATES
+
+DEBUG = False
+
+# Ключ из репозитория известен всем: без своего процесс не запускается
+SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY")
+if not SECRET_KEY:
+    raise ImproperlyConfigured("Задайте переменную DJANGO_SECRET_KEY.")
+
+ALLOWED_HOSTS = os.environ.get("DJANGO_ALLOWED_HOSTS", "localhost").split(",")
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        # С явным списком loaders APP_DIRS должен быть выключен
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **TEMPLATES[0]["OPTIONS"],
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+
+# Загрузить все шаблоны в кэш при старте WSGI/ASGI-процесса
+TEMPLATE_WARMUP = True
+
+# Статика: перед запуском нужен ``manage.py collectstatic``
+STATIC_ROOT = os.environ.get(
+    "DJANGO_STATIC_ROOT", str(BASE_DIR / "static_root")
+)
+STATICFILES_STORAGE = (
+    "blogicum.staticfiles.CompressedManifestStaticFilesStorage"
+)
+# Отдача статики без веб-сервера — для развёртывания на одной машине
+MIDDLEWARE = [
+    MIDDLEWARE[0],  # SecurityMiddleware
+    "blogicum.staticfiles.PrecompressedStaticMiddleware",
+    *MIDDLEWARE[1:],
+]
+
+# Кэш обязан быть общим для всех процессов: через него сигналы сбрасывают
+# кэш лент, счётчики публикаций и горизонт отложенных публикаций.
+# LocMemCache из базовых настроек видит только свой процесс, и остальные
+# отдавали бы устаревшие ленты. По умолчанию — файловый кэш (процессы на
+# одной машине), с DJANGO_MEMCACHED=host:port[,host:port] — memcached
+# (нужен пакет pymemcache)
+if os.environ.get("DJANGO_MEMCACHED"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.environ["DJANGO_MEMCACHED"].split(","),
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get(
+                "DJANGO_CACHE_DIR", str(BASE_DIR / "cache")
+            ),
+            "OPTIONS": {"MAX_ENTRIES": 10_000},
+        },
+    }
+
+# PRAGMA для каждого нового соединения SQLite (blogicum/sqlite.py):
+# WAL — читатели не ждут записи; размеры — в байтах, cache_size < 0 — в КиБ.
+# Режим WAL сохраняется в файле базы
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "busy_timeout": 5000,  # мс
+}
@@ -0,0 +1,45 @@
+"""Настройка каждого нового соединения SQLite из ``SQLITE_PRAGMAS``.
+
+С журналом по умолчанию (``journal_mode=delete``) запись комментария
+на время фиксации блокирует всю базу: читатели ленты ждут, а при
+долгой записи получают «database is locked». В режиме WAL читатели
+видят последнее зафиксированное состояние и записи не ждут;
+``synchronous=NORMAL`` в этом режиме не теряет целостность при сбое
+процесса, а ``busy_timeout`` заставляет писателей ждать друг друга,
+а не падать сразу.
+
+Профиль задаётся в боевых настройках; при пустом ``SQLITE_PRAGMAS``
+соединения не меняются, и файлы баз разработчиков остаются как были.
+"""
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_NAME_RE = re.compile(r"[a-z_]+")
+_VALUE_RE = re.compile(r"-?\d+|[A-Za-z]+")
+
+
+def get_pragma_statements(pragmas):
+    """``PRAGMA``-инструкции для словаря ``имя -> значение``."""
+    statements = []
+    for name, value in pragmas.items():
+        value = str(value)
+        # PRAGMA не принимает параметры запроса — проверяем сами
+        if not _NAME_RE.fullmatch(name) or not _VALUE_RE.fullmatch(value):
+            raise ImproperlyConfigured(
+                f"Недопустимая настройка SQLITE_PRAGMAS: {name}={value}"
+            )
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    # Напрямую через sqlite3: мимо журнала запросов и execute_wrapper
+    for statement in get_pragma_statements(settings.SQLITE_PRAGMAS):
+        connection.connection.execute(statement)
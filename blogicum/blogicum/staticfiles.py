@@ -0,0 +1,168 @@
+"""Статика с хэшем в имени и заранее сжатыми копиями.
+
+``CompressedManifestStaticFilesStorage`` при ``collectstatic`` кладёт рядом
+с каждым файлом вида ``bootstrap.min.3f2a1b9c0d4e.css`` его копии
+``.gz`` и (если установлен пакет ``brotli``) ``.br``.
+``PrecompressedStaticMiddleware`` отдаёт такую статику без веб-сервера:
+выбирает сжатую копию по ``Accept-Encoding`` и разрешает кэшировать
+файлы с хэшем в имени навсегда.
+"""
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # Необязательная зависимость: без неё только gzip
+    brotli = None
+
+# Форматы, которые имеет смысл сжимать (картинки PNG/JPEG уже сжаты)
+COMPRESSIBLE_EXTENSIONS = (
+    ".css", ".js", ".svg", ".ico", ".txt", ".json", ".xml", ".map", ".html",
+)
+# Файлы меньше этого размера не сжимаем: выигрыш меньше накладных расходов
+MIN_COMPRESS_SIZE = 256
+# Срок кэширования файлов с хэшем в имени и без него
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+DEFAULT_MAX_AGE = 60
+
+
+def _compress(content):
+    """Сжатые варианты ``content``: суффикс файла -> байты."""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content)
+    return variants
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Манифест с хэшами плюс ``.gz``/``.br``-копии сжимаемых файлов."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in self.hashed_files.values():
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._save_compressed(name)
+
+    def _save_compressed(self, name):
+        with self.open(name) as original:
+            content = original.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, compressed in _compress(content).items():
+            if len(compressed) >= len(content):
+                continue
+            self.delete(name + suffix)
+            self._save(name + suffix, ContentFile(compressed))
+
+
+class PrecompressedStaticMiddleware:
+    """Отдаёт ``STATIC_ROOT`` со сжатыми копиями и долгим кэшированием.
+
+    Для развёртывания на одной машине без nginx; ставится сразу после
+    ``SecurityMiddleware``. Файл с хэшем в имени (из манифеста) кэшируется
+    клиентом на год с ``immutable``, остальные — на минуту.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def __init__(self, get_response):
+        if not settings.STATIC_ROOT or not settings.STATIC_URL:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        self.root = str(settings.STATIC_ROOT)
+        self._files = {}
+        self._hashed_names = None
+
+    def __call__(self, request):
+        if (
+            request.method in ("GET", "HEAD")
+            and request.path_info.startswith(self.prefix)
+        ):
+            found = self._find(request.path_info[len(self.prefix):])
+            if found is not None:
+                return self._serve(request, *found)
+        return self.get_response(request)
+
+    def _find(self, name):
+        """Путь к файлу и его сжатые копии; None, если файла нет."""
+        if name not in self._files:
+            try:
+                path = safe_join(self.root, name)
+            except SuspiciousFileOperation:  # Путь за пределами STATIC_ROOT
+                return None
+            if not os.path.isfile(path):
+                return None
+            variants = {
+                encoding: path + suffix
+                for encoding, suffix in self.encodings
+                if os.path.isfile(path + suffix)
+            }
+            self._files[name] = (name, path, variants)
+        return self._files[name]
+
+    def _is_hashed(self, name):
+        if self._hashed_names is None:
+            hashed_files = getattr(staticfiles_storage, "hashed_files", {})
+            self._hashed_names = set(hashed_files.values())
+        return name in self._hashed_names
+
+    @staticmethod
+    def _accepted_encodings(request):
+        accepted = set()
+        header = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        for token in header.split(","):
+            encoding, _, params = token.strip().partition(";")
+            if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00"):
+                accepted.add(encoding.strip().lower())
+        return accepted
+
+    def _serve(self, request, name, path, variants):
+        stat = os.stat(path)
+        if not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"),
+            stat.st_mtime,
+            stat.st_size,
+        ):
+            response = HttpResponseNotModified()
+        else:
+            accepted = self._accepted_encodings(request)
+            encoding = next(
+                (option for option in variants if option in accepted), None
+            )
+            content_type, _ = mimetypes.guess_type(path)
+            response = FileResponse(
+                open(variants.get(encoding, path), "rb"),
+                content_type=content_type or "application/octet-stream",
+                filename=os.path.basename(path),
+            )
+            if encoding:
+                response["Content-Encoding"] = encoding
+            response["Last-Modified"] = formatdate(
+                stat.st_mtime, usegmt=True
+            )
+        if variants:
+            patch_vary_headers(response, ("Accept-Encoding",))
+        if self._is_hashed(name):
+            response["Cache-Control"] = (
+                f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
+            )
+        else:
+            response["Cache-Control"] = f"public, max-age={DEFAULT_MAX_AGE}"
+        return response
@@ -0,0 +1,62 @@
+"""Предварительная загрузка шаблонов в кэширующий загрузчик.
+
+С ``django.template.loaders.cached.Loader`` каждый шаблон читается с диска
+и компилируется один раз на процесс. ``warm_templates()`` делает это при
+старте процесса, чтобы первые запросы после выкладки не платили за разбор.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_EXTENSIONS = (".html", ".txt")
+
+
+def iter_template_names(directory):
+    """Имена шаблонов в каталоге относительно него самого."""
+    for root, _dirs, files in os.walk(directory):
+        for filename in sorted(files):
+            if filename.endswith(TEMPLATE_EXTENSIONS):
+                path = os.path.join(root, filename)
+                yield os.path.relpath(path, directory).replace(os.sep, "/")
+
+
+def warm_templates(include_apps=False):
+    """Загружает все шаблоны проекта (и приложений, если нужно).
+
+    Возвращает количество загруженных шаблонов и словарь ошибок
+    ``{имя шаблона: исключение}``.
+    """
+    loaded = 0
+    errors = {}
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        directories = list(backend.engine.dirs)
+        if include_apps:
+            directories += get_app_template_dirs("templates")
+        for directory in directories:
+            for name in iter_template_names(directory):
+                try:
+                    backend.engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    errors[name] = error
+                else:
+                    loaded += 1
+    return loaded, errors
+
+
+def warm_templates_on_startup():
+    """Прогрев при старте WSGI/ASGI-процесса.
+
+    Шаблон с ошибкой не даёт процессу запуститься: так сломанная
+    выкладка видна сразу, а не на первом запросе к странице.
+    """
+    _loaded, errors = warm_templates()
+    if errors:
+        raise ImproperlyConfigured(
+            "Шаблоны с ошибками: "
+            + "; ".join(f"{name}: {error}" for name, error in errors.items())
+        )
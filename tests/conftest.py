@@ -18,6 +18,8 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings as django_settings
+from django.core.cache import cache
 from django.contrib.auth import get_user_model
 from django.db.models import Model, Field
 from django.forms import BaseForm
@@ -30,6 +32,9 @@ N_PER_FIXTURE = 3
 N_PER_PAGE = 10
 COMMENT_TEXT_DISPLAY_LEN_FOR_TESTS = 50
 
+# Боевые настройки без своего ключа не импортируются (их читают тесты)
+os.environ.setdefault("DJANGO_SECRET_KEY", "test-secret-key")
+
 KeyVal = NamedTuple("KeyVal", [("key", Optional[str]), ("val", Optional[str])])
 UrlRepr = NamedTuple("UrlRepr", [("url", str), ("repr", str)])
 TitledUrlRepr = TypeVar("TitledUrlRepr", bound=Tuple[UrlRepr, str])
@@ -41,6 +46,22 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def image_queue_without_threads():
+    # Рабочие потоки писали бы в общую базу в памяти во время теста;
+    # потоки включает только тест, который проверяет именно их
+    with override_settings(
+        IMAGE_QUEUE={**django_settings.IMAGE_QUEUE, "WORKERS": 0}
+    ):
+        yield
+
+
 class SafeImportFromContextManager:
     def __init__(
         self,
@@ -91,6 +112,7 @@ pytest_plugins = [
     "fixtures.locations",
     "fixtures.categories",
     "fixtures.comments",
+    "fixtures.query_budget",
     "adapters.comment",
 ]
 
@@ -365,6 +387,7 @@ def cleanup(request):
                 filename.endswith(".jpg")
                 or filename.endswith(".gif")
                 or filename.endswith(".png")
+                or filename.endswith(".webp")
             ):
                 file_path = os.path.join(root, filename)
                 if os.path.getmtime(file_path) >= start_time:
@@ -0,0 +1,87 @@
+"""Проверка бюджета SQL-запросов (settings.QUERY_BUDGETS) в тестах.
+
+Любой тест, во время которого ``QueryBudgetMiddleware`` сообщил о
+превышении бюджета представлением, падает со списком запросов. Тесты,
+которые превышают бюджет намеренно, помечаются ``no_query_budget``.
+"""
+import logging
+
+import pytest
+from django.test import override_settings
+
+BUDGET_LOGGER = "blogicum.query_budget"
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "no_query_budget: не проверять бюджет SQL-запросов представлений",
+    )
+
+
+class _OverrunHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.overruns = []
+
+    def emit(self, record):
+        stats = getattr(record, "query_stats", None)
+        if stats is not None:
+            self.overruns.append((record.getMessage(), stats))
+
+
+def _format_overrun(message, stats):
+    queries = "\n".join(
+        f"    {number}. {sql}"
+        for number, sql in enumerate(stats.queries, start=1)
+    )
+    return f"{message}\n{queries}"
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    handler = _OverrunHandler()
+    logger = logging.getLogger(BUDGET_LOGGER)
+    logger.addHandler(handler)
+    try:
+        with override_settings(QUERY_BUDGET_RECORD_SQL=True):
+            outcome = yield
+    finally:
+        logger.removeHandler(handler)
+    if (
+        handler.overruns
+        and outcome.excinfo is None
+        and item.get_closest_marker("no_query_budget") is None
+    ):
+        pytest.fail(
+            "Представление превысило бюджет SQL-запросов из "
+            "settings.QUERY_BUDGETS:\n"
+            + "\n".join(
+                _format_overrun(message, stats)
+                for message, stats in handler.overruns
+            ),
+            pytrace=False,
+        )
+
+
+@pytest.fixture
+def query_budget():
+    """Проверяет ответ на бюджет запросов, заданный в тесте или настройках.
+
+    Возвращает статистику запросов ответа (``QueryStats``).
+    """
+    def check(response, budget=None):
+        stats = response.query_stats
+        if budget is None:
+            budget = stats.budget
+        assert budget is not None, (
+            f"Для представления {stats.view_name} не задан бюджет запросов"
+            " в settings.QUERY_BUDGETS."
+        )
+        assert stats.count <= budget, _format_overrun(
+            f"{stats.view_name}: {stats.count} SQL-запросов"
+            f" при бюджете {budget}",
+            stats,
+        )
+        return stats
+    return check
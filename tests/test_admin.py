@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+
+
+def _changelist_queries(client, url, **params):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url, model",
+    [("/admin/blog/post/", "Post"), ("/admin/blog/comment/", "Comment")],
+)
+def test_changelist_queries_do_not_grow(
+    admin_client, mixer, published_category, published_location, url, model
+):
+    def add_rows(number):
+        posts = mixer.cycle(number).blend(
+            "blog.Post",
+            category=published_category,
+            location=published_location,
+        )
+        if model == "Comment":
+            for post in posts:
+                mixer.blend("blog.Comment", post=post)
+
+    add_rows(2)
+    _, few = _changelist_queries(admin_client, url)
+    add_rows(10)
+    _, many = _changelist_queries(admin_client, url)
+    assert few == many, (
+        "Убедитесь, что список в админке выбирает связанные объекты"
+        " одним запросом (`list_select_related`)."
+    )
+
+
+@pytest.mark.django_db
+def test_author_filter_is_an_input(admin_client, mixer, published_category):
+    users = mixer.cycle(5).blend("auth.User")
+    posts = [
+        mixer.blend("blog.Post", author=user, category=published_category)
+        for user in users
+    ]
+    response, _ = _changelist_queries(admin_client, "/admin/blog/post/")
+    content = response.content.decode("utf-8")
+    assert f"author__id__exact={users[0].pk}" not in content, (
+        "Убедитесь, что фильтр по автору не выводит список всех"
+        " пользователей."
+    )
+
+    response, _ = _changelist_queries(
+        admin_client, "/admin/blog/post/", author=users[0].username
+    )
+    assert [post.pk for post in response.context["cl"].result_list] == [
+        posts[0].pk
+    ]
+
+
+@pytest.mark.django_db
+def test_unfiltered_count_is_estimated(
+    admin_client, mixer, published_category
+):
+    mixer.cycle(3).blend("blog.Post", category=published_category)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    mixer.cycle(2).blend("blog.Post", category=published_category)
+
+    with override_settings(POSTS_COUNT_ESTIMATE_THRESHOLD=0):
+        response, _ = _changelist_queries(admin_client, "/admin/blog/post/")
+        assert response.context["cl"].result_count == 3, (
+            "Убедитесь, что для списка без фильтров количество берётся из"
+            " статистики СУБД, а не `COUNT(*)`."
+        )
+        response, _ = _changelist_queries(
+            admin_client, "/admin/blog/post/", is_published__exact=1
+        )
+        assert response.context["cl"].result_count == Post.objects.filter(
+            is_published=True
+        ).count()
+
+
+@pytest.mark.django_db
+def test_post_form_does_not_list_all_users(admin_client, mixer):
+    users = mixer.cycle(5).blend("auth.User")
+    content = admin_client.get("/admin/blog/post/add/").content.decode(
+        "utf-8"
+    )
+    assert f'value="{users[-1].pk}"' not in content, (
+        "Убедитесь, что поле автора в форме поста использует автодополнение"
+        " вместо списка всех пользователей."
+    )
@@ -0,0 +1,57 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+
+
+def _call(view, path, **kwargs):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return async_to_sync(view)(request, **kwargs)
+
+
+@pytest.mark.django_db
+def test_async_feeds_match_sync(
+    client, many_posts_with_published_locations
+):
+    from blog import async_views
+
+    post = many_posts_with_published_locations[0]
+    pages = [
+        ("/?page=2", async_views.index, {}),
+        (
+            f"/category/{post.category.slug}/",
+            async_views.category_posts,
+            {"slug": post.category.slug},
+        ),
+        (
+            f"/profile/{post.author.username}/",
+            async_views.profile_detail,
+            {"username": post.author.username},
+        ),
+    ]
+    for path, view, kwargs in pages:
+        expected = [
+            item.id for item in client.get(path).context["page_obj"]
+        ]
+        cache.clear()  # Иначе асинхронный вариант отдаст кэш синхронного
+        response = _call(view, path, **kwargs)
+        assert response.status_code == 200
+        html = response.content.decode("utf-8")
+        for post_id in expected:
+            assert f"/posts/{post_id}/" in html, (
+                f"Убедитесь, что асинхронный вариант `{path}` показывает"
+                " те же публикации, что и синхронный."
+            )
+
+
+@pytest.mark.django_db
+def test_async_post_detail(post_with_published_location):
+    from blog import async_views
+
+    post = post_with_published_location
+    response = _call(
+        async_views.post_detail, f"/posts/{post.id}/", post_id=post.id
+    )
+    assert post.title in response.content.decode("utf-8")
@@ -0,0 +1,40 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from blog.management.commands.benchmark_routes import iter_routes
+
+
+@pytest.mark.django_db
+def test_benchmark_covers_named_routes():
+    cache.set("blog:test-sentinel", 1)
+    out = StringIO()
+    call_command(
+        "benchmark_routes",
+        "--no-test-database",
+        "--posts=40",
+        "--comments-per-post=2",
+        "--requests=2",
+        "--warmup=0",
+        stdout=out,
+    )
+    report = json.loads(out.getvalue())
+    assert set(report["routes"]) == {name for name, _params in iter_routes()}
+    for name, result in report["routes"].items():
+        assert set(result) == {"url", "status", "queries", "p50_ms", "p95_ms"}
+        # У страниц pages:author и pages:tech пока нет шаблонов
+        if name not in ("pages:author", "pages:tech"):
+            assert result["status"] == 200, (
+                f"Убедитесь, что маршрут {name} отвечает на GET без ошибок."
+            )
+    assert report["routes"]["blog:search"]["queries"] > 2, (
+        "Убедитесь, что поиск замеряется с непустым запросом."
+    )
+
+    call_command("benchmark_post_card", "--rounds=2", stdout=StringIO())
+    assert cache.get("blog:test-sentinel") == 1, (
+        "Убедитесь, что замеры не очищают общий кэш сайта."
+    )
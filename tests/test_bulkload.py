@@ -0,0 +1,76 @@
+import gzip
+import io
+import json
+from pathlib import Path
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+
+from blog.streaming import iter_json_array
+
+FIXTURE = Path(__file__).resolve().parent.parent / "db.json"
+# Права и типы содержимого уже созданы миграциями тестовой базы
+LOADED_APPS = ("auth.user", "blog.")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_json_array(chunk_size):
+    data = [{"pk": 1, "text": "a, ]"}, 12345, [1, [2]], "x"]
+    stream = io.StringIO(json.dumps(data, ensure_ascii=False, indent=2))
+    assert list(iter_json_array(stream, chunk_size)) == data
+
+
+def test_iter_json_array_rejects_truncated_input():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[{"pk": 1}, {"pk"'), 4))
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("compress", [False, True])
+def test_bulkload_matches_fixture(tmp_path, compress):
+    objects = [
+        obj for obj in json.loads(FIXTURE.read_text(encoding="utf-8"))
+        if obj["model"].startswith(LOADED_APPS)
+    ]
+    post_data = next(obj for obj in objects if obj["model"] == "blog.post")
+    objects += [
+        {
+            "model": "blog.comment",
+            "pk": pk,
+            "fields": {
+                "post": post_data["pk"],
+                "author": post_data["fields"]["author"],
+                "text": f"Комментарий {pk}",
+                "created_at": "2023-01-01T00:00:00Z",
+            },
+        }
+        for pk in (1, 2)
+    ]
+    if compress:
+        fixture = tmp_path / "db.json.gz"
+        stream = gzip.open(fixture, "wt", encoding="utf-8")
+    else:
+        fixture = tmp_path / "db.json"
+        stream = fixture.open("w", encoding="utf-8")
+    with stream:
+        json.dump(objects, stream, ensure_ascii=False)
+
+    call_command("bulkload", str(fixture), batch_size=2, stdout=io.StringIO())
+
+    expected = {}
+    for obj in objects:
+        expected[obj["model"]] = expected.get(obj["model"], 0) + 1
+    for label, count in expected.items():
+        assert apps.get_model(label).objects.count() == count, (
+            f"Убедитесь, что `bulkload` загружает все объекты `{label}`."
+        )
+
+    post = apps.get_model("blog.post").objects.get(pk=post_data["pk"])
+    assert post.updated_at.isoformat().startswith(
+        post_data["fields"]["updated_at"][:19]
+    ), "Убедитесь, что `bulkload` сохраняет `updated_at` из фикстуры."
+    assert post.comment_count == 2, (
+        "Убедитесь, что после загрузки комментариев `bulkload` пересчитывает"
+        " `Post.comment_count`."
+    )
@@ -0,0 +1,63 @@
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comments(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Первый"})
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Второй"})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при добавлении комментария увеличивается"
+        " `Post.comment_count`."
+    )
+
+    comment = post.comments.first()
+    user_client.post(f"/posts/{post.id}/delete_comment/{comment.id}/")
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        "Убедитесь, что при удалении комментария уменьшается"
+        " `Post.comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_command(mixer, post_with_published_location):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    type(post).objects.filter(pk=post.pk).update(comment_count=0)
+
+    call_command("recount_comments", batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что команда `recount_comments` пересчитывает"
+        " `Post.comment_count`."
+    )
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_per_comment_updates(
+    mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment")
+    mixer.cycle(20).blend("blog.Comment", post=post)
+    with CaptureQueriesContext(connection) as context:
+        post.delete()
+    assert len(context.captured_queries) < 20, (
+        "Убедитесь, что при удалении поста его комментарии не обновляют"
+        " счётчик и ленты по одному."
+    )
+
+    comment.delete()
+    comment.post.refresh_from_db()
+    assert comment.post.comment_count == 0, (
+        "Убедитесь, что после удаления поста счётчик остальных постов"
+        " по-прежнему обновляется."
+    )
@@ -0,0 +1,151 @@
+import time
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+from django.test.utils import CaptureQueriesContext
+
+
+def _revalidate(client, url, response):
+    with CaptureQueriesContext(connection) as context:
+        revalidated = client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+    return revalidated, context.captured_queries
+
+
+@pytest.mark.django_db
+def test_post_detail_not_modified(
+    mixer, user_client, another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = user_client.get(url)
+    assert response.has_header("ETag") and response.has_header(
+        "Last-Modified"
+    ), "Убедитесь, что страница поста отдаёт ETag и Last-Modified."
+
+    revalidated, queries = _revalidate(user_client, url, response)
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED, (
+        "Убедитесь, что неизменившаяся страница поста отдаёт 304."
+    )
+    post_queries = [q["sql"] for q in queries if "blog_" in q["sql"]]
+    assert len(post_queries) == 1, (
+        "Убедитесь, что для ответа 304 достаточно одного запроса к данным"
+        " поста."
+    )
+
+    other = another_user_client.get(url)
+    assert other["ETag"] != response["ETag"], (
+        "Убедитесь, что ETag страницы поста зависит от пользователя."
+    )
+
+    comment = mixer.blend("blog.Comment", post=post)
+    revalidated, _ = _revalidate(user_client, url, response)
+    assert revalidated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после нового комментария страница поста"
+        " отдаётся заново."
+    )
+
+    comment.text = "Исправленный текст"
+    comment.save()
+    assert _revalidate(user_client, url, revalidated)[0].status_code == (
+        HTTPStatus.OK
+    ), "Убедитесь, что правка комментария меняет ETag страницы поста."
+
+
+@pytest.mark.django_db
+def test_post_detail_if_modified_since(
+    client, post_with_published_location
+):
+    url = f"/posts/{post_with_published_location.id}/"
+    response = client.get(url)
+    revalidated = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert revalidated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_hidden_post_is_not_revalidated(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    response = another_user_client.get(url)
+    post.is_published = False
+    post.save()
+    revalidated, _ = _revalidate(another_user_client, url, response)
+    assert revalidated.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_feeds_not_modified(
+    mixer, client, user_client, user, post_with_published_location
+):
+    category = post_with_published_location.category
+    for feed_client in (client, user_client):
+        for url in ("/", f"/category/{category.slug}/"):
+            response = feed_client.get(url)
+            revalidated, queries = _revalidate(feed_client, url, response)
+            assert revalidated.status_code == HTTPStatus.NOT_MODIFIED, (
+                f"Убедитесь, что неизменившаяся лента `{url}` отдаёт 304."
+            )
+            if feed_client is client:
+                assert not queries, (
+                    "Убедитесь, что 304 для анонимов отдаётся по кэшу лент"
+                    " без запросов к БД."
+                )
+
+    response = client.get("/")
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=category,
+        is_published=True,
+        pub_date=timezone.now(),
+    )
+    revalidated, _ = _revalidate(client, "/", response)
+    assert revalidated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после добавления поста лента отдаётся заново."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_validators_skip_aggregates(user_client):
+    user_client.get("/?page=2")
+    with CaptureQueriesContext(connection) as context:
+        user_client.get("/?page=2")
+    aggregates = [
+        q["sql"] for q in context.captured_queries
+        if "COUNT(" in q["sql"] or "MAX(" in q["sql"]
+    ]
+    assert not aggregates, (
+        "Убедитесь, что ETag ленты считается без агрегатов по всем постам:"
+        f" {aggregates}"
+    )
+
+
+@pytest.mark.django_db
+def test_feed_last_modified_moves_forward_on_delete(
+    mixer, user_client, user, post_with_published_location
+):
+    newest = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=post_with_published_location.category,
+        is_published=True,
+        pub_date=timezone.now(),
+    )
+    response = user_client.get("/")
+    # Удаление на пару секунд позже: Last-Modified точен до секунды
+    with mock.patch("blog.caching.time") as clock:
+        clock.time.return_value = time.time() + 2
+        newest.delete()
+    revalidated = user_client.get(
+        "/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    )
+    assert revalidated.status_code == HTTPStatus.OK, (
+        "Убедитесь, что после удаления поста Last-Modified ленты не"
+        " становится раньше, чем был."
+    )
@@ -0,0 +1,75 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+def test_export_endpoint_ndjson(
+    admin_client, mixer, many_posts_with_published_locations
+):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    response = admin_client.get("/export/posts/")
+    assert response.status_code == HTTPStatus.OK
+    assert response.streaming, (
+        "Убедитесь, что выгрузка отдаётся через `StreamingHttpResponse`."
+    )
+    rows = [
+        json.loads(line)
+        for line in b"".join(response.streaming_content).decode().splitlines()
+    ]
+    assert [row["id"] for row in rows] == sorted(
+        item.id for item in many_posts_with_published_locations
+    )
+    row = next(row for row in rows if row["id"] == post.id)
+    assert row["author"] == post.author.username
+    assert row["category"] == post.category.slug
+    assert row["location"] == post.location.name
+    assert row["comment_count"] == 2
+
+
+@pytest.mark.django_db
+def test_export_endpoint_csv_comments(admin_client, mixer, comment):
+    response = admin_client.get("/export/comments/", {"format": "csv"})
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"].startswith("text/csv")
+    content = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(content)))
+    assert [int(row["id"]) for row in rows] == [comment.id]
+    assert rows[0]["text"] == comment.text
+
+
+@pytest.mark.django_db
+def test_export_endpoint_requires_staff(user_client, admin_client):
+    response = user_client.get("/export/posts/")
+    assert response.status_code == HTTPStatus.FOUND, (
+        "Убедитесь, что выгрузка недоступна пользователям без прав"
+        " персонала."
+    )
+    assert admin_client.get("/export/users/").status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert admin_client.get(
+        "/export/posts/", {"format": "xml"}
+    ).status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_export_command(tmp_path, many_posts_with_published_locations):
+    output = tmp_path / "posts.csv"
+    call_command(
+        "export_posts", format="csv", output=str(output), chunk_size=3
+    )
+    with output.open(encoding="utf-8", newline="") as stream:
+        rows = list(csv.DictReader(stream))
+    assert len(rows) == len(many_posts_with_published_locations)
+
+    stdout = io.StringIO()
+    call_command("export_posts", chunk_size=3, stdout=stdout)
+    assert len(stdout.getvalue().splitlines()) == len(
+        many_posts_with_published_locations
+    )
@@ -0,0 +1,174 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blogicum import settings_production
+
+
+@pytest.mark.django_db
+def test_anonymous_feed_is_cached(
+    mixer, client, user, published_category, post_with_published_location
+):
+    client.get("/")
+    with CaptureQueriesContext(connection) as context:
+        client.get("/")
+    assert not context.captured_queries, (
+        "Убедитесь, что главная лента для анонимных посетителей отдаётся"
+        " из кэша."
+    )
+
+    new_post = mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        title="Свежая публикация",
+    )
+    for url in ("/", f"/category/{published_category.slug}/"):
+        assert new_post.title in client.get(url).content.decode("utf-8"), (
+            "Убедитесь, что кэш ленты сбрасывается при добавлении поста."
+        )
+
+
+@pytest.mark.django_db
+def test_feed_cache_ignores_unknown_params(
+    client, post_with_published_location
+):
+    from django.core.cache import cache
+
+    client.get("/")
+    client.get("/", {"page": "2"})
+    keys = len(cache._cache)
+    with CaptureQueriesContext(connection) as context:
+        for params in ({"utm": "x"}, {"x": "1" * 300}, {"page": "abc"}):
+            client.get("/", params)
+    assert not context.captured_queries and len(cache._cache) == keys, (
+        "Убедитесь, что посторонние параметры запроса не создают новых"
+        " записей в кэше лент."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_follows_username_only(
+    mixer, client, user, post_with_published_location
+):
+    client.get("/")
+    mixer.blend("auth.User")
+    user.set_password("новый-пароль")
+    user.save()
+    with CaptureQueriesContext(connection) as context:
+        client.get("/")
+    assert not context.captured_queries, (
+        "Убедитесь, что регистрация и смена пароля не сбрасывают кэш лент."
+    )
+
+    user.username = "новое_имя"
+    user.save()
+    assert "новое_имя" in client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что смена имени автора сбрасывает кэш лент."
+    )
+
+
+@pytest.mark.django_db
+def test_feed_cache_respects_scheduled_posts(
+    mixer, user, published_category
+):
+    from blog.caching import get_feed_cache_timeout
+
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert get_feed_cache_timeout() <= 30, (
+        "Убедитесь, что страница ленты не кэшируется дольше, чем до"
+        " ближайшей отложенной публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_publication_horizon_follows_posts(
+    mixer, client, user, published_category
+):
+    from blog.publication import get_publication_horizon
+
+    assert get_publication_horizon() is None
+    pub_date = timezone.now() + timedelta(hours=1)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=pub_date,
+    )
+    assert get_publication_horizon() == pub_date, (
+        "Убедитесь, что горизонт публикаций обновляется при сохранении поста."
+    )
+
+    response = client.get("/")
+    assert "Expires" in response, (
+        "Убедитесь, что лента для анонимов отдаёт заголовок `Expires`."
+    )
+    max_age = int(response["Cache-Control"].split("max-age=")[1])
+    assert max_age <= 3600, (
+        "Убедитесь, что срок кэширования ленты не выходит за ближайшую"
+        " отложенную публикацию."
+    )
+
+    post.delete()
+    assert get_publication_horizon() is None
+
+
+@pytest.mark.django_db
+def test_publication_horizon_expires_without_reset(
+    settings, mixer, user, published_category
+):
+    from blog.publication import get_publication_horizon
+
+    settings.PUBLICATION_HORIZON_TIMEOUT = 60
+    assert get_publication_horizon() is None
+    pub_date = timezone.now() + timedelta(hours=1)
+    # Пост сохранил другой процесс: сброс горизонта сюда не дошёл
+    with mock.patch("blog.signals.reset_publication_horizon"):
+        mixer.blend(
+            "blog.Post", author=user, category=published_category,
+            pub_date=pub_date,
+        )
+    assert get_publication_horizon() is None
+    with mock.patch(
+        "django.core.cache.backends.locmem.time.time",
+        return_value=time.time() + 61,
+    ):
+        assert get_publication_horizon() == pub_date, (
+            "Убедитесь, что горизонт публикаций хранится в кэше не дольше"
+            " PUBLICATION_HORIZON_TIMEOUT."
+        )
+
+
+def test_production_cache_is_shared():
+    backend = settings_production.CACHES["default"]["BACKEND"]
+    assert "locmem" not in backend, (
+        "Убедитесь, что в боевых настройках кэш общий для всех процессов:"
+        " иначе сброс кэша лент доходит только до одного из них."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_cache_follows_post_changes(
+    user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    post.title = "Новый заголовок"
+    post.save()
+    assert post.title in user_client.get("/").content.decode("utf-8"), (
+        "Убедитесь, что кэш карточки поста обновляется при изменении поста."
+    )
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    assert post.category.title in user_client.get("/").content.decode(
+        "utf-8"
+    ), "Убедитесь, что кэш карточки обновляется при изменении категории."
@@ -0,0 +1,82 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+from blog.search import search_posts
+
+User = get_user_model()
+
+
+def _generate(seed, **options):
+    options = {
+        "users": 10,
+        "categories": 4,
+        "locations": 3,
+        "posts": 60,
+        "comments": 600,
+        "batch_size": 25,
+        **options,
+    }
+    call_command("generate_data", seed=seed, stdout=StringIO(), **options)
+
+
+def _snapshot():
+    return [
+        (post.title, post.text, post.author.username, post.comment_count)
+        for post in Post.objects.select_related("author").order_by("pk")
+    ], list(
+        Comment.objects.order_by("pk").values_list(
+            "post__title", "author__username", "text"
+        )
+    )
+
+
+@pytest.mark.django_db
+def test_generate_data_counts_and_skew():
+    _generate(1, unpublished=0.5, future=0.2)
+    assert User.objects.count() == 10
+    assert Category.objects.count() == 4
+    assert Location.objects.count() == 3
+    assert Post.objects.count() == 60
+    assert Comment.objects.count() == 600
+
+    assert Post.objects.filter(is_published=False).exists()
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        "Убедитесь, что среди публикаций есть отложенные."
+    )
+    counts = Post.objects.annotate(real=Count("comments")).values_list(
+        "comment_count", "real"
+    )
+    assert all(stored == real for stored, real in counts), (
+        "Убедитесь, что после генерации пересчитан Post.comment_count."
+    )
+    top = Post.objects.order_by("-comment_count").first()
+    assert top.comment_count > 600 / 60 * 3, (
+        "Убедитесь, что комментарии распределены неравномерно."
+    )
+    word = top.title.split()[0]
+    assert top in search_posts(Post.objects.all(), word), (
+        "Убедитесь, что после генерации перестроен поисковый индекс."
+    )
+
+
+@pytest.mark.django_db
+def test_generate_data_is_deterministic():
+    _generate(7)
+    first = _snapshot()
+    Post.objects.all().delete()
+    User.objects.all().delete()
+    Category.objects.all().delete()
+    Location.objects.all().delete()
+
+    _generate(7)
+    assert _snapshot() == first, (
+        "Убедитесь, что при одинаковом зерне генерируются одинаковые данные."
+    )
+    _generate(8)
+    assert Post.objects.count() == 120
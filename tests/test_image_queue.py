@@ -0,0 +1,160 @@
+from datetime import timedelta
+from importlib import import_module
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.utils import timezone
+from PIL import Image
+
+from blog.image_queue import get_worker_pool
+from blog.models import ImageJob, Post
+from blog.thumbnails import generate_thumbnails, iter_thumbnail_names
+
+
+def _image_file():
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return ImageFile(buffer, name="queued_image.jpg")
+
+
+@pytest.mark.django_db
+def test_database_queue(
+    settings, django_capture_on_commit_callbacks, post_with_published_location
+):
+    settings.IMAGE_QUEUE = {
+        "BACKEND": "blog.image_queue.DatabaseQueue",
+        "WORKERS": 0,
+    }
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = _image_file()
+        post.save()
+    assert ImageJob.objects.filter(post=post).count() == 1, (
+        "Убедитесь, что после сохранения поста с новой картинкой в очередь"
+        " ставится задание."
+    )
+    post.refresh_from_db()
+    assert not post.images_ready
+
+    call_command("process_image_jobs", once=True, stdout=StringIO())
+
+    assert not ImageJob.objects.exists()
+    post.refresh_from_db()
+    assert post.images_ready
+    assert all(
+        post.image.storage.exists(name)
+        for name in iter_thumbnail_names(post.image.name)
+    )
+
+
+@pytest.mark.django_db
+def test_database_queue_reclaims_stale_jobs(
+    settings, post_with_published_location
+):
+    settings.IMAGE_QUEUE = {
+        "BACKEND": "blog.image_queue.DatabaseQueue",
+        "WORKERS": 0,
+        "STALE_AFTER": 60,
+    }
+    post = post_with_published_location
+    ImageJob.objects.create(
+        post=post,
+        image=post.image.name,
+        started_at=timezone.now() - timedelta(seconds=30),
+    )
+    assert get_worker_pool().drain() == 0, (
+        "Убедитесь, что задание, которое обрабатывается, не выдаётся снова."
+    )
+    ImageJob.objects.update(started_at=timezone.now() - timedelta(hours=1))
+    assert get_worker_pool().drain() == 1, (
+        "Убедитесь, что брошенное обработчиком задание выдаётся снова."
+    )
+    post.refresh_from_db()
+    assert post.images_ready
+
+
+@pytest.mark.django_db
+def test_job_for_replaced_image_is_skipped(
+    settings, django_capture_on_commit_callbacks, post_with_published_location
+):
+    settings.IMAGE_QUEUE = {
+        "BACKEND": "blog.image_queue.MemoryQueue",
+        "WORKERS": 0,
+    }
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = _image_file()
+        post.save()
+    Post.objects.filter(pk=post.pk).update(image="")
+
+    assert get_worker_pool().drain() == 1
+    post.refresh_from_db()
+    assert not post.images_ready
+
+
+@pytest.fixture
+def worker_threads(settings):
+    # Один поток: в общей базе в памяти SQLite параллельная запись сразу
+    # падает с «table is locked», не дожидаясь busy_timeout
+    settings.IMAGE_QUEUE = {
+        "BACKEND": "blog.image_queue.MemoryQueue",
+        "WORKERS": 1,
+    }
+    pool = get_worker_pool()
+    yield pool
+    # Потоки останавливаются до очистки базы в конце теста
+    pool.stop()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_threads_process_uploads(
+    worker_threads, mixer, user, published_category
+):
+    # Задания ставятся после фиксации: потоки не пишут в базу в памяти,
+    # пока в неё пишет сам тест
+    with transaction.atomic():
+        posts = [
+            mixer.blend(
+                "blog.Post",
+                author=user,
+                category=published_category,
+                image=_image_file(),
+            )
+            for _ in range(3)
+        ]
+    worker_threads.queue.join()
+
+    assert Post.objects.filter(
+        pk__in=[post.pk for post in posts], images_ready=True
+    ).count() == len(posts), (
+        "Убедитесь, что рабочие потоки обрабатывают картинки постов в"
+        " фоне."
+    )
+
+
+@pytest.mark.django_db
+def test_migration_marks_existing_images(mixer, post_with_published_location):
+    migration = import_module("blog.migrations.0007_post_images_ready_imagejob")
+    with_copies = post_with_published_location
+    generate_thumbnails(with_copies.image)
+    without_copies = mixer.blend(
+        "blog.Post",
+        author=with_copies.author,
+        category=with_copies.category,
+        image=_image_file(),
+    )
+    Post.objects.update(images_ready=False)
+    # От редактора схемы функции нужно только соединение
+    migration.mark_existing_images(apps, SimpleNamespace(connection=connection))
+    assert Post.objects.get(pk=with_copies.pk).images_ready, (
+        "Убедитесь, что миграция отмечает готовыми картинки, у которых уже"
+        " есть копии."
+    )
+    assert not Post.objects.get(pk=without_copies.pk).images_ready
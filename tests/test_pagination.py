@@ -0,0 +1,138 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from conftest import N_PER_PAGE
+
+
+def _get_cursor_page(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что страница `{url}` в режиме курсорной пагинации"
+        " отображается без ошибок."
+    )
+    return response
+
+
+@pytest.mark.django_db
+def test_cursor_pagination(user_client, many_posts_with_published_locations):
+    expected_ids = [
+        post.id
+        for post in sorted(
+            many_posts_with_published_locations,
+            key=lambda post: (post.pub_date, post.id),
+            reverse=True,
+        )
+    ]
+    seen_ids = []
+    url = "/?cursor="
+    pages = []
+    while url:
+        response = _get_cursor_page(user_client, url)
+        page_obj = response.context["page_obj"]
+        assert len(page_obj) <= N_PER_PAGE
+        seen_ids.extend(post.id for post in page_obj)
+        pages.append([post.id for post in page_obj])
+        next_cursor = page_obj.next_cursor
+        url = f"/?cursor={next_cursor}" if next_cursor else None
+        if next_cursor:
+            assert f"?cursor={next_cursor}" in response.content.decode(
+                "utf-8"
+            ), "Убедитесь, что на странице есть ссылка на следующую страницу."
+
+    assert seen_ids == expected_ids, (
+        "Убедитесь, что курсорная пагинация выдаёт все публикации ленты"
+        " по одному разу в порядке убывания даты публикации."
+    )
+
+    previous_cursor = page_obj.previous_cursor
+    response = _get_cursor_page(user_client, f"/?cursor={previous_cursor}")
+    assert [post.id for post in response.context["page_obj"]] == pages[-2], (
+        "Убедитесь, что ссылка на предыдущую страницу ведёт на неё."
+    )
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_bad_cursor(
+    user_client, many_posts_with_published_locations
+):
+    response = _get_cursor_page(user_client, "/?cursor=not-a-cursor")
+    first_page = _get_cursor_page(user_client, "/?cursor=")
+    assert [post.id for post in response.context["page_obj"]] == [
+        post.id for post in first_page.context["page_obj"]
+    ]
+    assert not re.search(r"\?page=", response.content.decode("utf-8"))
+
+
+@pytest.mark.django_db
+def test_feed_count_is_cheap_and_cached(
+    user_client, many_posts_with_published_locations
+):
+    with CaptureQueriesContext(connection) as first:
+        user_client.get("/?page=2")
+    count_queries = [
+        query["sql"] for query in first.captured_queries
+        if "__count" in query["sql"]
+    ]
+    assert len(count_queries) == 1
+    assert "GROUP BY" not in count_queries[0], (
+        "Убедитесь, что общее количество публикаций считается без"
+        " аннотации количества комментариев."
+    )
+    assert "auth_user" not in count_queries[0]
+
+    with CaptureQueriesContext(connection) as second:
+        user_client.get("/?page=2")
+    assert not any(
+        "__count" in query["sql"] for query in second.captured_queries
+    ), "Убедитесь, что общее количество публикаций ленты кэшируется."
+
+    many_posts_with_published_locations[0].delete()
+    response = user_client.get("/?page=2")
+    assert response.context["page_obj"].paginator.count == len(
+        many_posts_with_published_locations
+    ) - 1, "Убедитесь, что кэш количества сбрасывается при удалении поста."
+
+
+@pytest.mark.django_db
+def test_comment_pages(mixer, user_client, post_with_published_location):
+    post = post_with_published_location
+    comments = mixer.cycle(5).blend("blog.Comment", post=post)
+    expected_ids = [comment.id for comment in comments]
+
+    with override_settings(COMMENTS_PER_PAGE=2):
+        response = user_client.get(f"/posts/{post.id}/")
+        seen_ids = [comment.id for comment in response.context["comments"]]
+        cursor = response.context["comments"].next_cursor
+        while cursor:
+            response = user_client.get(
+                f"/posts/{post.id}/comments/",
+                {"cursor": cursor, "format": "json"},
+            )
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            seen_ids.extend(comment["id"] for comment in data["comments"])
+            cursor = data["next_cursor"]
+
+    assert seen_ids == expected_ids, (
+        "Убедитесь, что комментарии поста подгружаются страницами по"
+        " порядку их создания без пропусков и повторов."
+    )
+
+
+@pytest.mark.django_db
+def test_comment_pages_hidden_post(
+    another_user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    response = another_user_client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарии неопубликованного поста недоступны"
+        " другим пользователям."
+    )
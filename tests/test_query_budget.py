@@ -0,0 +1,95 @@
+import logging
+import re
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("as_author", [False, True], ids=["anon", "author"])
+@pytest.mark.parametrize(
+    "url_template",
+    [
+        "/",
+        "/category/{category}/",
+        "/profile/{author}/",
+        "/posts/{post}/",
+        "/posts/{post}/comments/",
+        "/search/?q={word}",
+    ],
+)
+def test_read_views_fit_budget(
+    client,
+    user_client,
+    mixer,
+    many_posts_with_published_locations,
+    query_budget,
+    as_author,
+    url_template,
+):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    url = url_template.format(
+        category=post.category.slug,
+        author=post.author.username,
+        post=post.id,
+        word=post.title.split()[0],
+    )
+    response = (user_client if as_author else client).get(url)
+    assert response.status_code == HTTPStatus.OK
+    query_budget(response)
+
+
+@pytest.mark.django_db
+def test_server_timing_header(user_client, post_with_published_location):
+    with CaptureQueriesContext(connection) as context:
+        response = user_client.get(f"/posts/{post_with_published_location.id}/")
+    match = re.fullmatch(
+        r'db;dur=\d+\.\d;desc="(\d+) queries"', response["Server-Timing"]
+    )
+    assert match, (
+        "Убедитесь, что ответ содержит заголовок `Server-Timing` с числом"
+        f" запросов к БД и их временем: {response['Server-Timing']}"
+    )
+    assert int(match.group(1)) == len(context.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.no_query_budget
+def test_budget_overrun_is_logged(
+    user_client, post_with_published_location, settings, caplog
+):
+    settings.QUERY_BUDGETS = {"blog:post_detail": 1}
+    url = f"/posts/{post_with_published_location.id}/"
+    with caplog.at_level(logging.WARNING, logger="blogicum.query_budget"):
+        response = user_client.get(url)
+    assert response.query_stats.over_budget
+    assert [record.query_stats for record in caplog.records] == [
+        response.query_stats
+    ], "Убедитесь, что превышение бюджета запросов записывается в лог."
+    assert "blog:post_detail" in caplog.records[0].getMessage()
+
+    settings.QUERY_BUDGETS = {}
+    caplog.clear()
+    with caplog.at_level(logging.WARNING, logger="blogicum.query_budget"):
+        user_client.get(url)
+    assert not caplog.records, (
+        "Убедитесь, что представления без бюджета не попадают в лог."
+    )
+
+
+@pytest.mark.django_db
+def test_query_budget_fixture_fails_on_overrun(
+    user_client, post_with_published_location, query_budget
+):
+    response = user_client.get(f"/posts/{post_with_published_location.id}/")
+    stats = query_budget(response)
+    with pytest.raises(
+        AssertionError, match="SQL-запросов при бюджете 1"
+    ) as error:
+        query_budget(response, budget=1)
+    assert stats.queries[0] in str(error.value), (
+        "Убедитесь, что сообщение о превышении бюджета перечисляет запросы."
+    )
@@ -0,0 +1,73 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == 200
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+def test_post_detail_comments_without_n_plus_one(
+    mixer, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    mixer.blend("blog.Comment", post=post)
+    with_one_comment = _count_queries(user_client, url)
+
+    mixer.cycle(10).blend("blog.Comment", post=post)
+    with_many_comments = _count_queries(user_client, url)
+
+    assert with_one_comment == with_many_comments, (
+        "Убедитесь, что число запросов к БД на странице поста не зависит"
+        " от количества комментариев."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "method, url_template, data, expected_queries",
+    [
+        ("get", "/posts/{post}/edit/", None, 5),
+        ("post", "/posts/{post}/edit/", "post_form", 9),
+        ("get", "/posts/{post}/delete/", None, 3),
+        ("post", "/posts/{post}/delete/", None, 9),
+        ("get", "/posts/{post}/edit_comment/{comment}/", None, 3),
+        ("post", "/posts/{post}/edit_comment/{comment}/", "comment_form", 7),
+        ("get", "/posts/{post}/delete_comment/{comment}/", None, 3),
+        ("post", "/posts/{post}/delete_comment/{comment}/", None, 7),
+    ],
+)
+def test_owner_views_fetch_object_once(
+    mixer,
+    user,
+    user_client,
+    post_with_published_location,
+    django_assert_num_queries,
+    method,
+    url_template,
+    data,
+    expected_queries,
+):
+    post = post_with_published_location
+    comment = mixer.blend("blog.Comment", post=post, author=user)
+    url = url_template.format(post=post.id, comment=comment.id)
+    form_data = {
+        "post_form": {
+            "title": "Заголовок",
+            "text": "Текст",
+            "pub_date": "2020-01-01 10:00",
+            "category": post.category_id,
+            "is_published": True,
+        },
+        "comment_form": {"text": "Новый текст"},
+    }.get(data)
+    # Сессия и пользователь — 2 запроса, объект — ровно 1,
+    # остальное — сама операция, форма и сигналы.
+    with django_assert_num_queries(expected_queries):
+        response = getattr(user_client, method)(url, form_data)
+    assert response.status_code in (200, 302)
@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != "sqlite",
+    reason="Проверка плана запроса написана для SQLite.",
+)
+
+
+def _get_feed_query(client, url):
+    with CaptureQueriesContext(connection) as context:
+        client.get(url)
+    feed_queries = [
+        query["sql"]
+        for query in context.captured_queries
+        if query["sql"].startswith('SELECT "blog_post"."id"')
+        and "LIMIT" in query["sql"]
+    ]
+    assert feed_queries, f"Не найден запрос ленты для `{url}`."
+    return feed_queries[0]
+
+
+def _get_post_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute("EXPLAIN QUERY PLAN " + sql)
+        plan = [row[-1] for row in cursor.fetchall()]
+    return [step for step in plan if " blog_post " in f"{step} "]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url_template, index_name",
+    [
+        ("/", "post_published_feed_idx"),
+        ("/category/{category}/", "post_category_feed_idx"),
+        ("/profile/{author}/", "post_author_feed_idx"),
+    ],
+    ids=["index", "category", "profile"],
+)
+def test_feed_uses_index(
+    user_client,
+    another_user_client,
+    many_posts_with_published_locations,
+    url_template,
+    index_name,
+):
+    post = many_posts_with_published_locations[0]
+    url = url_template.format(
+        category=post.category.slug, author=post.author.username
+    )
+    for client in (user_client, another_user_client):
+        plan = _get_post_plan(_get_feed_query(client, url))
+        assert plan and all(
+            f"USING INDEX {index_name}" in step for step in plan
+        ), (
+            f"Убедитесь, что лента `{url}` читает таблицу публикаций по"
+            f" индексу `{index_name}`, а не полным сканированием: {plan}"
+        )
@@ -0,0 +1,101 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import Client
+
+from blogicum.replicas import PIN_COOKIE
+
+REPLICA = "replica"
+
+
+@pytest.fixture
+def replica(settings, tmp_path):
+    """Вторая база SQLite в файле со схемой, но без данных default.
+
+    Так видно, откуда страница читала данные: пост, созданный в тесте,
+    есть только в основной базе.
+    """
+    connections.settings[REPLICA] = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    settings.DATABASE_REPLICAS = [REPLICA]
+    try:
+        call_command("migrate", database=REPLICA, verbosity=0)
+        yield REPLICA
+    finally:
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+
+@pytest.mark.django_db
+def test_read_views_use_replica(replica, client, post_with_published_location):
+    post = post_with_published_location
+    response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что страница поста читает данные с реплики."
+    )
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что с реплик читают только страницы из REPLICA_VIEWS."
+    )
+
+
+@pytest.mark.django_db
+def test_write_pins_to_primary(
+    replica, user, post_with_published_location, settings
+):
+    # Сессия в основной базе: вход — тоже запись, он закрепляет посетителя
+    user.set_password("secret")
+    user.save()
+    client = Client()
+    response = client.post(
+        "/auth/login/", {"username": user.username, "password": "secret"}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    post = post_with_published_location
+    response = client.post(
+        f"/posts/{post.id}/comment/", {"text": "Свежий комментарий"}
+    )
+    assert response.cookies[PIN_COOKIE]["max-age"] == (
+        settings.REPLICA_PIN_SECONDS
+    )
+    response = client.get(response["Location"])
+    assert response.status_code == HTTPStatus.OK
+    assert "Свежий комментарий" in response.content.decode(), (
+        "Убедитесь, что после записи посетитель читает с основной базы."
+    )
+
+    client.cookies.pop(PIN_COOKIE)
+    response = client.get(f"/posts/{post.id}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_replica_feed_cached_briefly(replica, client, settings):
+    response = client.get("/")
+    assert response.status_code == HTTPStatus.OK
+    assert f"max-age={settings.REPLICA_PIN_SECONDS}" in (
+        response["Cache-Control"]
+    ), "Убедитесь, что лента с реплики кэшируется не дольше закрепления."
+    expires = [
+        expiry for key, expiry in cache._expire_info.items()
+        if "blog:feed-page:" in key
+    ]
+    assert expires and max(expires) <= (
+        time.time() + settings.REPLICA_PIN_SECONDS
+    ), "Убедитесь, что лента с реплики хранится в кэше лент недолго."
+
+
+@pytest.mark.django_db
+def test_without_replicas_everything_reads_primary(
+    client, post_with_published_location
+):
+    response = client.get(f"/posts/{post_with_published_location.id}/")
+    assert response.status_code == HTTPStatus.OK
+    assert PIN_COOKIE not in response.cookies
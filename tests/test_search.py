@@ -0,0 +1,152 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="Обычный текст", **kwargs):
+        fields = {
+            "author": user,
+            "category": published_category,
+            "is_published": True,
+            "pub_date": timezone.now() - timedelta(days=1),
+            "title": title,
+            "text": text,
+            **kwargs,
+        }
+        return mixer.blend("blog.Post", **fields)
+    return make
+
+
+def _found_ids(client, query, **params):
+    response = client.get("/search/", {"q": query, **params})
+    assert response.status_code == HTTPStatus.OK
+    return [post.id for post in response.context["page_obj"]]
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_filters(client, make_post, mixer, user):
+    in_text = make_post("Прогулка", "Видели жирафа у реки")
+    in_title = make_post("Жираф в зоопарке")
+    make_post("Жираф в черновике", is_published=False)
+    make_post(
+        "Жираф из будущего", pub_date=timezone.now() + timedelta(days=1)
+    )
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    make_post("Жираф в скрытой категории", category=hidden_category)
+    make_post("Про слонов")
+
+    assert _found_ids(client, "жираф") == [in_title.id, in_text.id], (
+        "Убедитесь, что поиск находит только видимые посты и ставит"
+        " совпадения в заголовке выше совпадений в тексте."
+    )
+    assert _found_ids(client, "") == []
+    assert _found_ids(client, '"жираф* (') == [in_title.id, in_text.id], (
+        "Убедитесь, что спецсимволы в запросе не ломают поиск."
+    )
+
+
+@pytest.mark.django_db
+def test_search_index_follows_posts(client, make_post):
+    post = make_post("Кенгуру")
+    assert _found_ids(client, "кенгуру") == [post.id]
+
+    post.title = "Коала"
+    post.save()
+    assert _found_ids(client, "кенгуру") == []
+    assert _found_ids(client, "коала") == [post.id], (
+        "Убедитесь, что индекс обновляется при изменении поста."
+    )
+
+    post.delete()
+    assert _found_ids(client, "коала") == []
+
+
+@pytest.mark.django_db
+def test_search_does_not_scan_with_like(client, make_post):
+    make_post("Енот")
+    with CaptureQueriesContext(connection) as context:
+        client.get("/search/", {"q": "енот"})
+    assert not any(
+        "LIKE" in query["sql"] for query in context.captured_queries
+    ), "Убедитесь, что поиск использует полнотекстовый индекс."
+
+
+@pytest.mark.django_db
+def test_search_pagination_keeps_query(client, make_post):
+    posts = [make_post(f"Лиса {number}") for number in range(N_PER_PAGE + 2)]
+    response = client.get("/search/", {"q": "лиса"})
+    assert len(response.context["page_obj"]) == N_PER_PAGE
+    assert "?q=%D0%BB%D0%B8%D1%81%D0%B0&amp;page=2" in response.content.decode(
+        "utf-8"
+    ), "Убедитесь, что ссылки пагинации поиска сохраняют запрос."
+    second_page = _found_ids(client, "лиса", page=2)
+    assert len(second_page) == len(posts) - N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_rebuild_search_index(client, make_post):
+    post = make_post("Барсук")
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_fts")
+    assert _found_ids(client, "барсук") == []
+
+    call_command("rebuild_search_index", stdout=StringIO())
+    assert _found_ids(client, "барсук") == [post.id]
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_index(admin_client, make_post):
+    post = make_post("Выдра")
+    response = admin_client.get("/admin/blog/post/", {"q": "выдра"})
+    assert response.status_code == HTTPStatus.OK
+    assert [item.id for item in response.context["cl"].result_list] == [
+        post.id
+    ]
+
+
+@pytest.mark.django_db
+def test_search_matches_once(client, make_post):
+    if connection.vendor != "sqlite":
+        pytest.skip("План запроса проверяется для FTS5 в SQLite.")
+    make_post("Ёж")
+    with CaptureQueriesContext(connection) as context:
+        client.get("/search/", {"q": "ёж"})
+    searches = [
+        query["sql"] for query in context.captured_queries
+        if "MATCH" in query["sql"]
+    ]
+    assert searches
+    for sql in searches:
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        assert sql.count("MATCH") == 1 and "CORRELATED" not in plan, (
+            "Убедитесь, что поиск выполняет MATCH по индексу один раз, а не"
+            f" подзапросом для каждого поста: {plan}"
+        )
+
+
+@pytest.mark.django_db
+def test_loaddata_indexes_posts(client, make_post, tmp_path):
+    post = make_post("Бобр")
+    fixture = tmp_path / "posts.json"
+    call_command(
+        "dumpdata", "blog.Post", output=str(fixture), stdout=StringIO()
+    )
+    type(post).objects.all().delete()
+    assert _found_ids(client, "бобр") == []
+
+    call_command("loaddata", str(fixture), stdout=StringIO())
+    assert _found_ids(client, "бобр") == [post.id], (
+        "Убедитесь, что посты из фикстуры попадают в поисковый индекс."
+    )
@@ -0,0 +1,193 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError, connections, transaction
+
+from blogicum import settings_production
+from blogicum.sqlite import get_pragma_statements
+
+ALIAS = "stress"
+
+pytestmark = pytest.mark.skipif(
+    connections["default"].vendor != "sqlite",
+    reason="Проверка настроек соединений SQLite.",
+)
+
+
+@pytest.fixture
+def production_pragmas(settings):
+    settings.SQLITE_PRAGMAS = settings_production.SQLITE_PRAGMAS
+
+
+@pytest.fixture
+def file_db(tmp_path, django_db_blocker):
+    """База SQLite во временном файле; у каждого потока своё соединение."""
+    connections.settings[ALIAS] = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "stress.sqlite3"),
+    }
+    with django_db_blocker.unblock():
+        try:
+            with connections[ALIAS].cursor() as cursor:
+                cursor.execute(
+                    "CREATE TABLE item (id INTEGER PRIMARY KEY, value TEXT)"
+                )
+            yield ALIAS
+        finally:
+            connections[ALIAS].close()
+            del connections[ALIAS]
+            del connections.settings[ALIAS]
+
+
+def _in_thread(function):
+    """Выполняет ``function`` в потоке со своим соединением к базе."""
+    def run(*args):
+        try:
+            return function(*args)
+        finally:
+            connections[ALIAS].close()
+    return run
+
+
+def _count_items():
+    with connections[ALIAS].cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM item")
+        return cursor.fetchone()[0]
+
+
+def _read_during_write(hold_seconds=0.5):
+    """Читает таблицу, пока другой поток держит открытую запись.
+
+    Возвращает (результат чтения или исключение, время чтения).
+    """
+    started_write = threading.Event()
+
+    @_in_thread
+    def write():
+        with connections[ALIAS].cursor() as cursor:
+            # Как фиксация большой записи: в обычном журнале блокировка
+            # EXCLUSIVE не пускает и читателей, в WAL — только писателей
+            cursor.execute("BEGIN EXCLUSIVE")
+            cursor.execute("INSERT INTO item (value) VALUES ('новый')")
+            started_write.set()
+            time.sleep(hold_seconds)
+            cursor.execute("COMMIT")
+
+    @_in_thread
+    def read():
+        started_write.wait()
+        started = time.perf_counter()
+        try:
+            result = _count_items()
+        except OperationalError as error:
+            result = error
+        return result, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        writer = executor.submit(write)
+        reader = executor.submit(read)
+        writer.result()
+        return reader.result()
+
+
+def test_pragmas_applied_to_new_connections(
+    production_pragmas, file_db, settings
+):
+    with connections[file_db].cursor() as cursor:
+        values = {}
+        for name in settings.SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}")
+            values[name] = cursor.fetchone()[0]
+    assert values == {
+        "journal_mode": "wal",
+        "synchronous": 1,  # NORMAL
+        "mmap_size": settings.SQLITE_PRAGMAS["mmap_size"],
+        "cache_size": settings.SQLITE_PRAGMAS["cache_size"],
+        "busy_timeout": settings.SQLITE_PRAGMAS["busy_timeout"],
+    }, "Убедитесь, что настройки SQLITE_PRAGMAS применяются к соединению."
+
+
+def test_default_settings_leave_sqlite_unchanged(file_db):
+    with connections[file_db].cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        assert cursor.fetchone()[0] == "delete", (
+            "Убедитесь, что профиль SQLITE_PRAGMAS включается только в"
+            " боевых настройках."
+        )
+
+
+def test_invalid_pragma_rejected():
+    with pytest.raises(ImproperlyConfigured):
+        get_pragma_statements({"journal_mode": "wal; DROP TABLE item"})
+
+
+def test_readers_do_not_wait_for_writer(production_pragmas, file_db):
+    result, elapsed = _read_during_write()
+    assert result == 0, (
+        "Убедитесь, что во время записи читатель видит последнее"
+        f" зафиксированное состояние, а не ошибку: {result!r}"
+    )
+    assert elapsed < 0.25, (
+        f"Убедитесь, что чтение не ждёт записи (ждало {elapsed:.2f} с)."
+    )
+
+
+@pytest.fixture
+def rollback_journal(settings):
+    settings.SQLITE_PRAGMAS = {"journal_mode": "delete", "busy_timeout": 5000}
+
+
+def test_rollback_journal_blocks_readers(rollback_journal, file_db):
+    # Для сравнения: без WAL тот же читатель ждёт конца записи
+    result, elapsed = _read_during_write(hold_seconds=0.5)
+    assert result == 1
+    assert elapsed >= 0.4
+
+
+def test_concurrent_comment_writes_and_feed_reads(
+    production_pragmas, file_db
+):
+    writers, readers, rows = 4, 4, 50
+    done = threading.Event()
+
+    @_in_thread
+    def write(number):
+        for row in range(rows):
+            with transaction.atomic(using=ALIAS):
+                with connections[ALIAS].cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO item (value) VALUES (%s)",
+                        [f"{number}-{row}"],
+                    )
+                    time.sleep(0.002)  # Запись держит блокировку дольше
+
+    @_in_thread
+    def read(_number):
+        latencies = []
+        while not done.is_set():
+            started = time.perf_counter()
+            _count_items()
+            latencies.append(time.perf_counter() - started)
+        return latencies
+
+    with ThreadPoolExecutor(max_workers=writers + readers) as executor:
+        reading = [executor.submit(read, n) for n in range(readers)]
+        writing = [executor.submit(write, n) for n in range(writers)]
+        try:
+            for future in writing:
+                future.result()  # «database is locked» всплыл бы здесь
+        finally:
+            done.set()
+        latencies = [
+            latency for future in reading for latency in future.result()
+        ]
+
+    assert _count_items() == writers * rows
+    assert latencies, "Читатели не успели выполнить ни одного запроса."
+    assert max(latencies) < 0.25, (
+        "Убедитесь, что чтение ленты не ждёт записи комментариев:"
+        f" самое долгое чтение — {max(latencies):.2f} с."
+    )
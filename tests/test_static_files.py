@@ -0,0 +1,87 @@
+import gzip
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test import Client, override_settings
+
+from blogicum import settings_production
+
+STORAGE = "blogicum.staticfiles.CompressedManifestStaticFilesStorage"
+
+
+@pytest.fixture
+def collected_static(tmp_path):
+    with override_settings(STATIC_ROOT=tmp_path, STATICFILES_STORAGE=STORAGE):
+        call_command("collectstatic", interactive=False, verbosity=0)
+        manifest = json.loads(
+            (tmp_path / "staticfiles.json").read_text(encoding="utf-8")
+        )
+        yield tmp_path, manifest["paths"]
+
+
+def test_collectstatic_writes_hashed_compressed_files(collected_static):
+    root, paths = collected_static
+    hashed = paths["css/bootstrap.min.css"]
+    assert hashed != "css/bootstrap.min.css", (
+        "Убедитесь, что имена собранных статических файлов содержат хэш"
+        " содержимого."
+    )
+    original = (root / hashed).read_bytes()
+    assert gzip.decompress((root / f"{hashed}.gz").read_bytes()) == original
+    assert not (root / f"{paths['img/logo.png']}.gz").exists(), (
+        "Убедитесь, что уже сжатые форматы картинок не сжимаются повторно."
+    )
+
+
+def test_collectstatic_writes_brotli_files(collected_static):
+    brotli = pytest.importorskip("brotli")
+    root, paths = collected_static
+    hashed = paths["css/bootstrap.min.css"]
+    assert brotli.decompress((root / f"{hashed}.br").read_bytes()) == (
+        (root / hashed).read_bytes()
+    )
+
+
+@pytest.mark.django_db
+def test_middleware_serves_precompressed_static(collected_static):
+    root, paths = collected_static
+    hashed = paths["css/bootstrap.min.css"]
+    with override_settings(MIDDLEWARE=settings_production.MIDDLEWARE):
+        client = Client()
+        response = client.get(
+            f"/static/{hashed}", HTTP_ACCEPT_ENCODING="gzip, deflate"
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Content-Type"].startswith("text/css")
+        assert "Accept-Encoding" in response["Vary"]
+        assert "immutable" in response["Cache-Control"], (
+            "Убедитесь, что статика с хэшем в имени кэшируется надолго."
+        )
+        assert b"".join(response.streaming_content) == (
+            (root / f"{hashed}.gz").read_bytes()
+        )
+
+        response = client.get(f"/static/{hashed}", HTTP_ACCEPT_ENCODING="")
+        assert "Content-Encoding" not in response
+        assert b"".join(response.streaming_content) == (
+            (root / hashed).read_bytes()
+        )
+
+        last_modified = response["Last-Modified"]
+        response = client.get("/static/css/bootstrap.min.css")
+        assert "immutable" not in response["Cache-Control"]
+
+        response = client.get(
+            f"/static/{hashed}", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        traversal = client.get("/static/%2E%2E/manage.py")
+        assert traversal.status_code == HTTPStatus.NOT_FOUND
+        page = client.get("/").content.decode("utf-8")
+        assert f"/static/{paths['img/fav/favicon.ico']}" in page, (
+            "Убедитесь, что страницы ссылаются на статику с хэшем в имени."
+        )
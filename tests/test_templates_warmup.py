@@ -0,0 +1,34 @@
+import importlib
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import override_settings
+
+from blogicum import settings_production
+from blogicum.templates_warmup import warm_templates_on_startup
+
+
+def test_all_templates_compile(capsys):
+    call_command("warm_templates")
+    assert "Загружено шаблонов" in capsys.readouterr().out, (
+        "Убедитесь, что все шаблоны проекта компилируются без ошибок."
+    )
+
+
+def test_broken_template_stops_startup(tmp_path, settings):
+    (tmp_path / "broken.html").write_text("{% if %}", encoding="utf-8")
+    templates = [{**settings.TEMPLATES[0], "DIRS": [tmp_path]}]
+    with override_settings(TEMPLATES=templates):
+        with pytest.raises(ImproperlyConfigured, match="broken.html"):
+            warm_templates_on_startup()
+
+
+def test_production_requires_secret_key(monkeypatch):
+    monkeypatch.delenv("DJANGO_SECRET_KEY")
+    try:
+        with pytest.raises(ImproperlyConfigured, match="DJANGO_SECRET_KEY"):
+            importlib.reload(settings_production)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(settings_production)
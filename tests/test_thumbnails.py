@@ -0,0 +1,115 @@
+from io import BytesIO, StringIO
+
+import pytest
+from bs4 import BeautifulSoup
+from django.conf import settings
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.image_queue import get_worker_pool
+from blog.thumbnails import iter_thumbnail_names, thumbnail_name
+
+
+def _image_file(size, name="big_image.png"):
+    buffer = BytesIO()
+    Image.new("RGBA", size, color=(73, 109, 137, 255)).save(
+        buffer, format="PNG"
+    )
+    return ImageFile(buffer, name=name)
+
+
+def _image_sources(content):
+    soup = BeautifulSoup(content.decode("utf-8"), features="html.parser")
+    return [tag["src"] for tag in soup.find_all("img")] + [
+        tag["srcset"] for tag in soup.find_all("source")
+    ]
+
+
+@pytest.fixture
+def upload_image(settings, django_capture_on_commit_callbacks):
+    """Сохраняет новую картинку поста и обрабатывает её очередь."""
+    settings.IMAGE_QUEUE = {
+        "BACKEND": "blog.image_queue.MemoryQueue",
+        "WORKERS": 0,
+    }
+
+    def upload(post, image_file):
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = image_file
+            post.save()
+        assert not post.images_ready
+        assert get_worker_pool().drain() == 1
+        post.refresh_from_db()
+        return post.image
+
+    return upload
+
+
+@pytest.mark.django_db
+def test_thumbnails_generated_on_upload(
+    upload_image, post_with_published_location
+):
+    post = post_with_published_location
+    image = upload_image(post, _image_file((100, 100), "first.png"))
+    assert post.images_ready, (
+        "Убедитесь, что после обработки картинки пост отмечается флагом"
+        " `images_ready`."
+    )
+    for name in iter_thumbnail_names(image.name):
+        assert image.storage.exists(name), (
+            "Убедитесь, что для загруженной картинки поста создаются её"
+            " уменьшенные копии."
+        )
+
+    box = settings.THUMBNAIL_SIZES["card"]
+    new_image = upload_image(post, _image_file((box[0] * 3, box[1])))
+    with Image.open(
+        new_image.storage.path(thumbnail_name(new_image.name, "card", "webp"))
+    ) as thumbnail:
+        assert thumbnail.size == (box[0], box[1] // 3)
+    assert not any(
+        image.storage.exists(name) for name in iter_thumbnail_names(image.name)
+    ), "Убедитесь, что копии заменённой картинки удаляются."
+
+
+@pytest.mark.django_db
+def test_feeds_do_not_ship_original(
+    user_client, upload_image, post_with_published_location
+):
+    post = post_with_published_location
+    sources = _image_sources(user_client.get("/").content)
+    assert post.image.url not in sources, (
+        "Убедитесь, что пока копии картинки не готовы, в ленте выводится"
+        " заглушка, а не оригинал."
+    )
+
+    upload_image(post, _image_file((100, 100)))
+    for url in ("/", f"/category/{post.category.slug}/"):
+        sources = _image_sources(user_client.get(url).content)
+        assert post.image.url not in sources, (
+            "Убедитесь, что в лентах показываются уменьшенные копии"
+            " картинок, а не оригиналы."
+        )
+        assert post.image.storage.url(
+            thumbnail_name(post.image.name, "card", "webp")
+        ) in sources
+
+    sources = _image_sources(user_client.get(f"/posts/{post.id}/").content)
+    assert post.image.storage.url(
+        thumbnail_name(post.image.name, "detail", "jpeg")
+    ) in sources
+
+
+@pytest.mark.django_db
+def test_generate_thumbnails_command(post_with_published_location):
+    post = post_with_published_location
+    call_command("generate_thumbnails", stdout=StringIO())
+
+    post.refresh_from_db()
+    assert post.images_ready
+    for name in iter_thumbnail_names(post.image.name):
+        assert post.image.storage.exists(name), (
+            "Убедитесь, что `generate_thumbnails` создаёт недостающие"
+            " копии картинок."
+        )